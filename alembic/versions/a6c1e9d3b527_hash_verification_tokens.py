@@ -0,0 +1,60 @@
+"""Store verification tokens as HMAC digests
+
+Revision ID: a6c1e9d3b527
+Revises: f4b2d8e6a1c3
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+import hashlib
+import hmac
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c1e9d3b527'
+down_revision: Union[str, None] = 'f4b2d8e6a1c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('verification_tokens', sa.Column('token_hash', sa.LargeBinary(length=32), nullable=True))
+    
+    # Hash pending tokens so links already sent keep working. The digest is
+    # computed here rather than with app.core.security.hash_verification_token
+    # so this revision keeps writing HMAC-SHA256 (keyed with JWT_SECRET_KEY)
+    # whatever that function becomes later
+    key = settings.JWT_SECRET_KEY.encode()
+    conn = op.get_bind()
+    tokens = sa.table(
+        'verification_tokens',
+        sa.column('id', sa.Integer),
+        sa.column('token', sa.String),
+        sa.column('token_hash', sa.LargeBinary),
+    )
+    rows = conn.execute(sa.select(tokens.c.id, tokens.c.token)).all()
+    if rows:
+        conn.execute(
+            tokens.update().where(tokens.c.id == sa.bindparam('_id')),
+            [{'_id': row.id, 'token_hash': hmac.new(key, row.token.encode(), hashlib.sha256).digest()} for row in rows],
+        )
+    
+    op.alter_column('verification_tokens', 'token_hash', nullable=False)
+    op.create_index(op.f('ix_verification_tokens_token_hash'), 'verification_tokens', ['token_hash'], unique=True)
+    op.drop_index(op.f('ix_verification_tokens_token'), table_name='verification_tokens')
+    op.drop_column('verification_tokens', 'token')
+
+
+def downgrade() -> None:
+    # Raw tokens can't be recovered from their digests, so pending tokens are
+    # dropped; users can request a new verification email
+    op.execute('DELETE FROM verification_tokens')
+    op.add_column('verification_tokens', sa.Column('token', sa.String(length=36), nullable=False))
+    op.create_index(op.f('ix_verification_tokens_token'), 'verification_tokens', ['token'], unique=True)
+    op.drop_index(op.f('ix_verification_tokens_token_hash'), table_name='verification_tokens')
+    op.drop_column('verification_tokens', 'token_hash')
@@ -0,0 +1,41 @@
+"""Store verification_tokens.expires_at as timestamptz
+
+Revision ID: b9d3e5f7a2c4
+Revises: d5f7a9c1e3b8
+Create Date: 2026-10-15 13:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9d3e5f7a2c4'
+down_revision: Union[str, None] = 'd5f7a9c1e3b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing values were written as naive UTC
+    op.alter_column(
+        'verification_tokens',
+        'expires_at',
+        type_=sa.DateTime(timezone=True),
+        existing_type=sa.DateTime(),
+        existing_nullable=False,
+        postgresql_using="expires_at AT TIME ZONE 'UTC'",
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'verification_tokens',
+        'expires_at',
+        type_=sa.DateTime(),
+        existing_type=sa.DateTime(timezone=True),
+        existing_nullable=False,
+        postgresql_using="expires_at AT TIME ZONE 'UTC'",
+    )
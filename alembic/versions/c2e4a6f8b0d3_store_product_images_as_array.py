@@ -0,0 +1,40 @@
+"""Store products.images as a native varchar[] instead of JSON
+
+Revision ID: c2e4a6f8b0d3
+Revises: a3c5e7b9d1f2
+Create Date: 2026-10-15 15:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e4a6f8b0d3'
+down_revision: Union[str, None] = 'a3c5e7b9d1f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# ALTER COLUMN ... TYPE ... USING does not allow subqueries, so the values
+# are copied through a new column instead of converted in place
+
+
+def upgrade() -> None:
+    op.add_column('products', sa.Column('images_array', postgresql.ARRAY(sa.String()), nullable=True))
+    op.execute(
+        "UPDATE products SET images_array = "
+        "ARRAY(SELECT json_array_elements_text(images))"
+    )
+    op.drop_column('products', 'images')
+    op.alter_column('products', 'images_array', new_column_name='images', nullable=False)
+
+
+def downgrade() -> None:
+    op.add_column('products', sa.Column('images_json', sa.JSON(), nullable=True))
+    op.execute("UPDATE products SET images_json = to_json(images)")
+    op.drop_column('products', 'images')
+    op.alter_column('products', 'images_json', new_column_name='images', nullable=False)
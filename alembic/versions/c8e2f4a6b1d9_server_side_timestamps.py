@@ -0,0 +1,36 @@
+"""Generate created_at/updated_at on the database server
+
+Revision ID: c8e2f4a6b1d9
+Revises: a6c1e9d3b527
+Create Date: 2026-10-15 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e2f4a6b1d9'
+down_revision: Union[str, None] = 'a6c1e9d3b527'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['users', 'categories', 'products', 'orders', 'order_items', 'verification_tokens']
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        for column in ('created_at', 'updated_at'):
+            op.alter_column(table, column, server_default=sa.text("timezone('utc', now())"))
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        for column in ('created_at', 'updated_at'):
+            op.alter_column(
+                table,
+                column,
+                server_default=sa.text('now()') if table == 'verification_tokens' else None,
+            )
@@ -0,0 +1,29 @@
+"""Rename userrole enum labels to the lowercase role values
+
+Revision ID: d4f6b8a0c2e5
+Revises: c2e4a6f8b0d3
+Create Date: 2026-10-15 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f6b8a0c2e5'
+down_revision: Union[str, None] = 'c2e4a6f8b0d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ROLES = ('CUSTOMER', 'ADMIN')
+
+
+def upgrade() -> None:
+    for role in ROLES:
+        op.execute(f"ALTER TYPE userrole RENAME VALUE '{role}' TO '{role.lower()}'")
+
+
+def downgrade() -> None:
+    for role in ROLES:
+        op.execute(f"ALTER TYPE userrole RENAME VALUE '{role.lower()}' TO '{role}'")
@@ -0,0 +1,26 @@
+"""Add partial index on products (price_usd, id) for the listing order
+
+Revision ID: d5f7a9c1e3b8
+Revises: c8e2f4a6b1d9
+Create Date: 2026-10-15 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f7a9c1e3b8'
+down_revision: Union[str, None] = 'c8e2f4a6b1d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_products_active_price_id', 'products', ['price_usd', 'id'], unique=False, postgresql_where=sa.text('is_active'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_products_active_price_id', table_name='products')
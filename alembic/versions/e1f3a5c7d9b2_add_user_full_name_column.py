@@ -0,0 +1,35 @@
+"""Add generated users.full_name column
+
+Revision ID: e1f3a5c7d9b2
+Revises: b9d3e5f7a2c4
+Create Date: 2026-10-15 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f3a5c7d9b2'
+down_revision: Union[str, None] = 'b9d3e5f7a2c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column(
+        'full_name',
+        sa.String(length=255),
+        sa.Computed(
+            "CASE WHEN first_name <> '' AND last_name <> '' "
+            "THEN first_name || ' ' || last_name ELSE email END",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'full_name')
@@ -0,0 +1,30 @@
+"""Add partial indexes for product listing filters
+
+Revision ID: e3a9c5d17f42
+Revises: b7d41e8c2a90
+Create Date: 2026-10-15 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a9c5d17f42'
+down_revision: Union[str, None] = 'b7d41e8c2a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_products_active_category_price', 'products', ['category_id', 'price_usd'], unique=False, postgresql_where=sa.text('is_active'))
+    op.create_index('ix_products_featured', 'products', ['id'], unique=False, postgresql_where=sa.text('is_featured AND is_active'))
+    op.create_index('ix_products_in_stock', 'products', ['id'], unique=False, postgresql_where=sa.text('stock > 0 AND is_active'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_products_in_stock', table_name='products')
+    op.drop_index('ix_products_featured', table_name='products')
+    op.drop_index('ix_products_active_category_price', table_name='products')
@@ -0,0 +1,62 @@
+"""Add categories.product_count maintained by a trigger on products
+
+Revision ID: e7a9c1d3f5b6
+Revises: d4f6b8a0c2e5
+Create Date: 2026-10-15 16:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a9c1d3f5b6'
+down_revision: Union[str, None] = 'd4f6b8a0c2e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Counts active products only; an update that moves a product between
+# categories or toggles is_active is applied as a decrement plus an increment
+COUNT_FUNCTION = """
+CREATE FUNCTION products_category_count() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE'
+       AND OLD.category_id IS NOT DISTINCT FROM NEW.category_id
+       AND OLD.is_active = NEW.is_active THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.is_active AND OLD.category_id IS NOT NULL THEN
+        UPDATE categories SET product_count = product_count - 1 WHERE id = OLD.category_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.is_active AND NEW.category_id IS NOT NULL THEN
+        UPDATE categories SET product_count = product_count + 1 WHERE id = NEW.category_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    op.add_column('categories', sa.Column('product_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        "UPDATE categories SET product_count = counts.n FROM ("
+        "SELECT category_id, count(*) AS n FROM products "
+        "WHERE is_active GROUP BY category_id"
+        ") AS counts WHERE categories.id = counts.category_id"
+    )
+    op.execute(COUNT_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER products_category_count_trg "
+        "AFTER INSERT OR DELETE OR UPDATE OF category_id, is_active ON products "
+        "FOR EACH ROW EXECUTE FUNCTION products_category_count()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER products_category_count_trg ON products")
+    op.execute("DROP FUNCTION products_category_count()")
+    op.drop_column('categories', 'product_count')
@@ -0,0 +1,25 @@
+"""Add index on verification_tokens.expires_at
+
+Revision ID: f4b2d8e6a1c3
+Revises: e3a9c5d17f42
+Create Date: 2026-10-15 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b2d8e6a1c3'
+down_revision: Union[str, None] = 'e3a9c5d17f42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_verification_tokens_expires_at'), 'verification_tokens', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_verification_tokens_expires_at'), table_name='verification_tokens')
@@ -0,0 +1,65 @@
+"""Merge user shipping/company columns into JSONB address columns
+
+Revision ID: f6a8c0e2b4d1
+Revises: e1f3a5c7d9b2
+Create Date: 2026-10-15 14:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6a8c0e2b4d1'
+down_revision: Union[str, None] = 'e1f3a5c7d9b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# JSON key -> (old column, type)
+SHIPPING_COLUMNS = {
+    'street': ('shipping_street', sa.String(length=255)),
+    'city': ('shipping_city', sa.String(length=100)),
+    'postal_code': ('shipping_postal_code', sa.String(length=20)),
+    'country': ('shipping_country', sa.String(length=100)),
+    'state': ('shipping_state', sa.String(length=100)),
+}
+BILLING_COLUMNS = {
+    'name': ('company_name', sa.String(length=255)),
+    'tax_id': ('company_tax_id', sa.String(length=50)),
+    'street': ('company_address_street', sa.String(length=255)),
+    'city': ('company_address_city', sa.String(length=100)),
+    'postal_code': ('company_address_postal_code', sa.String(length=20)),
+    'country': ('company_address_country', sa.String(length=100)),
+    'state': ('company_address_state', sa.String(length=100)),
+}
+
+
+def _build_object(columns: dict) -> str:
+    """SQL for a JSON object of the non-null columns, NULL if all are null"""
+    pairs = ', '.join(f"'{key}', {column}" for key, (column, _) in columns.items())
+    return f"NULLIF(jsonb_strip_nulls(jsonb_build_object({pairs})), '{{}}'::jsonb)"
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('shipping_address', postgresql.JSONB(), nullable=True))
+    op.add_column('users', sa.Column('billing_address', postgresql.JSONB(), nullable=True))
+    op.execute(
+        f"UPDATE users SET shipping_address = {_build_object(SHIPPING_COLUMNS)}, "
+        f"billing_address = {_build_object(BILLING_COLUMNS)}"
+    )
+    for column, _ in [*SHIPPING_COLUMNS.values(), *BILLING_COLUMNS.values()]:
+        op.drop_column('users', column)
+
+
+def downgrade() -> None:
+    assignments = []
+    for source, columns in (('shipping_address', SHIPPING_COLUMNS), ('billing_address', BILLING_COLUMNS)):
+        for key, (column, type_) in columns.items():
+            op.add_column('users', sa.Column(column, type_, nullable=True))
+            assignments.append(f"{column} = {source} ->> '{key}'")
+    op.execute(f"UPDATE users SET {', '.join(assignments)}")
+    op.drop_column('users', 'billing_address')
+    op.drop_column('users', 'shipping_address')
@@ -0,0 +1,25 @@
+"""Add index on verification_tokens (user_id, created_at)
+
+Revision ID: f8b0d2e4a6c7
+Revises: e7a9c1d3f5b6
+Create Date: 2026-10-15 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f8b0d2e4a6c7'
+down_revision: Union[str, None] = 'e7a9c1d3f5b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_verification_tokens_user_id_created_at', 'verification_tokens', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_verification_tokens_user_id_created_at', table_name='verification_tokens')
@@ -1,12 +1,18 @@
-from datetime import timedelta
+import logging
+from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.dependencies import get_db, get_current_user, get_current_active_user
+from app.core.dependencies import (
+    get_db,
+    get_current_user,
+    get_current_active_user,
+    current_utc_now,
+)
 from app.core.security import create_access_token
 from app.core.config import settings
-from app.core.email import send_verification_email, send_welcome_email
+from app.core.email import queue_verification_email, queue_welcome_email
 from app.crud import user as crud_user
 from app.crud.verification_token import verification_token
 from app.schemas.auth import Token, EmailVerification, EmailResend
@@ -14,12 +20,19 @@ from app.schemas.user import UserCreate, UserResponse, UserUpdate
 from app.models.user import User
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Settings read on every request, resolved once at import
+_ACCESS_TOKEN_EXPIRES = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+_EMAIL_ENABLED = bool(
+    settings.RESEND_API_KEY and settings.RESEND_API_KEY != "re_your_api_key_here"
+)
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     user_in: UserCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Register a new user
@@ -31,41 +44,49 @@ async def register(
     - **phone**: Optional phone number
     """
     # Check if user already exists
-    existing_user = crud_user.get_by_email(db, email=user_in.email)
-    if existing_user:
+    if await crud_user.exists_by_email(db, email=user_in.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User with this email already exists"
         )
     
     # Create new user
-    user = crud_user.create(db, obj_in=user_in)
+    user = await crud_user.create(db, obj_in=user_in)
     
     # Generate verification token and send email (if RESEND_API_KEY is configured)
-    if settings.RESEND_API_KEY and settings.RESEND_API_KEY != "re_your_api_key_here":
+    if _EMAIL_ENABLED:
         try:
-            token = verification_token.create_for_user(db, user_id=user.id)
-            send_verification_email(
+            token = await verification_token.create_for_user(db, user_id=user.id)
+        except Exception:
+            # Log error but don't fail registration
+            logger.exception(
+                "Failed to create verification token",
+                extra={"user_id": user.id},
+            )
+        else:
+            # Queued for batched delivery so registration doesn't wait on Resend
+            await queue_verification_email(
                 email_to=user.email,
                 username=user.first_name or user.email,
-                token=token.token
+                token=token.token,
             )
-        except Exception as e:
-            # Log error but don't fail registration
-            print(f"Failed to send verification email: {str(e)}")
     else:
         # Auto-verify user if email is not configured (development only)
-        print("⚠️  RESEND_API_KEY not configured - auto-verifying user for development")
+        logger.warning(
+            "RESEND_API_KEY not configured - auto-verifying user for development",
+            extra={"user_id": user.id},
+        )
         user.is_verified = True
-        db.commit()
-        db.refresh(user)
+        # No refresh needed: is_verified is already set on the instance and
+        # updated_at is returned by the UPDATE (eager_defaults), so nothing is stale
+        await db.commit()
     
     return user
 
 
 @router.post("/login", response_model=Token)
 async def login(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     form_data: OAuth2PasswordRequestForm = Depends(),
 ):
     """
@@ -77,7 +98,7 @@ async def login(
     Returns JWT access token
     """
     # Authenticate user
-    user = crud_user.authenticate(
+    user = await crud_user.authenticate(
         db, 
         email=form_data.username,
         password=form_data.password
@@ -103,10 +124,9 @@ async def login(
         )
     
     # Create access token
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         subject=user.id,
-        expires_delta=access_token_expires
+        expires_delta=_ACCESS_TOKEN_EXPIRES
     )
     
     return {
@@ -131,14 +151,14 @@ async def get_current_user_info(
 async def update_current_user(
     user_in: UserUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Update current user profile
     
     Requires authentication
     """
-    user = crud_user.update(db, db_obj=current_user, obj_in=user_in)
+    user = await crud_user.update(db, db_obj=current_user, obj_in=user_in)
     return user
 
 
@@ -151,10 +171,9 @@ async def refresh_token(
     
     Requires valid token
     """
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         subject=current_user.id,
-        expires_delta=access_token_expires
+        expires_delta=_ACCESS_TOKEN_EXPIRES
     )
     
     return {
@@ -166,7 +185,8 @@ async def refresh_token(
 @router.post("/verify-email", status_code=status.HTTP_200_OK)
 async def verify_email(
     verification: EmailVerification,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
+    now: datetime = Depends(current_utc_now),
 ):
     """
     Verify user email with token
@@ -176,7 +196,9 @@ async def verify_email(
     Returns success message
     """
     # Validate token
-    is_valid, error_msg = verification_token.is_valid(db, token=verification.token)
+    is_valid, error_msg = await verification_token.is_valid(
+        db, token=verification.token, now=now
+    )
     
     if not is_valid:
         raise HTTPException(
@@ -185,14 +207,14 @@ async def verify_email(
         )
     
     # Get token and user
-    token_obj = verification_token.get_by_token(db, token=verification.token)
+    token_obj = await verification_token.get_by_token(db, token=verification.token)
     if not token_obj:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid verification token"
         )
     
-    user = crud_user.get(db, id=token_obj.user_id)
+    user = await crud_user.get(db, id=token_obj.user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -204,20 +226,16 @@ async def verify_email(
         return {"message": "Email already verified"}
     
     # Mark user as verified
-    user.is_verified = True
-    db.commit()
+    user = await crud_user.update(db, db_obj=user, obj_in={"is_verified": True})
     
     # Delete verification token
-    verification_token.delete_by_token(db, token=verification.token)
+    await verification_token.delete_by_token(db, token=verification.token)
     
     # Send welcome email
-    try:
-        send_welcome_email(
-            email_to=user.email,
-            username=user.first_name or user.email
-        )
-    except Exception as e:
-        print(f"Failed to send welcome email: {str(e)}")
+    await queue_welcome_email(
+        email_to=user.email,
+        username=user.first_name or user.email,
+    )
     
     return {"message": "Email verified successfully"}
 
@@ -225,7 +243,7 @@ async def verify_email(
 @router.post("/resend-verification", status_code=status.HTTP_200_OK)
 async def resend_verification_email(
     resend: EmailResend,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Resend verification email
@@ -235,7 +253,7 @@ async def resend_verification_email(
     Returns success message
     """
     # Get user by email
-    user = crud_user.get_by_email(db, email=resend.email)
+    user = await crud_user.get_by_email(db, email=resend.email)
     
     if not user:
         # Don't reveal if user exists or not (security)
@@ -249,23 +267,16 @@ async def resend_verification_email(
         )
     
     # Delete old tokens for this user
-    verification_token.delete_by_user_id(db, user_id=user.id)
+    await verification_token.delete_by_user_id(db, user_id=user.id)
     
     # Create new verification token
-    token = verification_token.create_for_user(db, user_id=user.id)
+    token = await verification_token.create_for_user(db, user_id=user.id)
     
     # Send verification email
-    try:
-        send_verification_email(
-            email_to=user.email,
-            username=user.first_name or user.email,
-            token=token.token
-        )
-    except Exception as e:
-        print(f"Failed to send verification email: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to send verification email"
-        )
+    await queue_verification_email(
+        email_to=user.email,
+        username=user.first_name or user.email,
+        token=token.token,
+    )
     
     return {"message": "Verification email sent"}
@@ -1,24 +1,29 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import cache_get_raw, cache_set_raw, cache_version
 from app.core.dependencies import get_db, get_current_admin
 from app.crud import category as crud_category
+from app.crud.category import ACTIVE_CATEGORIES_CACHE
 from app.models.product import Product
 from app.schemas.category import (
     CategoryCreate,
     CategoryUpdate,
     CategoryResponse,
-    CategoryWithProductCount,
+    CATEGORY_LIST_ADAPTER,
 )
 
 router = APIRouter()
 
+# The storefront category list changes rarely; writes invalidate it anyway
+CATEGORY_LIST_TTL_SECONDS = 60
 
-@router.get("/", response_model=List[CategoryWithProductCount])
+
+@router.get("/", response_model=List[CategoryResponse])
 async def list_categories(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     skip: int = Query(0, ge=0, description="Offset for pagination"),
     limit: int = Query(100, ge=1, le=100, description="Limit for pagination"),
     is_active: bool = Query(True, description="Filter by active status"),
@@ -30,84 +35,69 @@ async def list_categories(
     - **limit**: Number of items (1-100)
     - **is_active**: Show only active categories (default: true)
     """
+    cache_key = None
     if is_active:
-        categories = crud_category.category.get_active(db, skip=skip, limit=limit)
+        # The storefront list is served from the cache, which holds the
+        # serialized response body, so a hit is sent as-is
+        version = await cache_version(ACTIVE_CATEGORIES_CACHE)
+        cache_key = f"{ACTIVE_CATEGORIES_CACHE}:v{version}:{skip}:{limit}"
+        cached = await cache_get_raw(cache_key)
+        if cached is not None:
+            return Response(cached, media_type="application/json")
+        categories = await crud_category.get_active(db, skip=skip, limit=limit)
     else:
-        categories = crud_category.category.get_multi(db, skip=skip, limit=limit)
+        categories = await crud_category.get_multi(db, skip=skip, limit=limit)
     
-    # Add product counts
-    result = []
-    for cat in categories:
-        product_count = db.query(func.count(Product.id))\
-            .filter(Product.category_id == cat.id)\
-            .filter(Product.is_active == True)\
-            .scalar()
-        
-        cat_dict = CategoryResponse.model_validate(cat).model_dump()
-        cat_dict["product_count"] = product_count or 0
-        result.append(cat_dict)
+    # Rows come straight from the database, so skip re-validating them
+    items = [CategoryResponse.construct_from_orm(cat) for cat in categories]
+    if cache_key is None:
+        return items
     
-    return result
+    body = CATEGORY_LIST_ADAPTER.dump_json(items)
+    await cache_set_raw(cache_key, body, CATEGORY_LIST_TTL_SECONDS)
+    return Response(body, media_type="application/json")
 
 
-@router.get("/{category_id}", response_model=CategoryWithProductCount)
+@router.get("/{category_id}", response_model=CategoryResponse)
 async def get_category(
     category_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Get category by ID with product count
     """
-    category = crud_category.category.get(db, id=category_id)
+    category = await crud_category.get(db, id=category_id)
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Category not found"
         )
     
-    # Get product count
-    product_count = db.query(func.count(Product.id))\
-        .filter(Product.category_id == category.id)\
-        .filter(Product.is_active == True)\
-        .scalar()
-    
-    cat_dict = CategoryResponse.model_validate(category).model_dump()
-    cat_dict["product_count"] = product_count or 0
-    
-    return cat_dict
+    return CategoryResponse.construct_from_orm(category)
 
 
-@router.get("/slug/{slug}", response_model=CategoryWithProductCount)
+@router.get("/slug/{slug}", response_model=CategoryResponse)
 async def get_category_by_slug(
     slug: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Get category by slug with product count
     """
-    category = crud_category.category.get_by_slug(db, slug=slug)
+    category = await crud_category.get_by_slug(db, slug=slug)
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Category not found"
         )
     
-    # Get product count
-    product_count = db.query(func.count(Product.id))\
-        .filter(Product.category_id == category.id)\
-        .filter(Product.is_active == True)\
-        .scalar()
-    
-    cat_dict = CategoryResponse.model_validate(category).model_dump()
-    cat_dict["product_count"] = product_count or 0
-    
-    return cat_dict
+    return CategoryResponse.construct_from_orm(category)
 
 
 @router.post("/", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
 async def create_category(
     category_in: CategoryCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_admin: dict = Depends(get_current_admin),
 ):
     """
@@ -116,14 +106,13 @@ async def create_category(
     Requires admin authentication
     """
     # Check if slug already exists
-    existing = crud_category.category.get_by_slug(db, slug=category_in.slug)
-    if existing:
+    if await crud_category.exists_by_slug(db, slug=category_in.slug):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Category with this slug already exists"
         )
     
-    category = crud_category.category.create(db, obj_in=category_in)
+    category = await crud_category.create(db, obj_in=category_in)
     return category
 
 
@@ -131,7 +120,7 @@ async def create_category(
 async def update_category(
     category_id: int,
     category_in: CategoryUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_admin: dict = Depends(get_current_admin),
 ):
     """
@@ -139,7 +128,7 @@ async def update_category(
     
     Requires admin authentication
     """
-    category = crud_category.category.get(db, id=category_id)
+    category = await crud_category.get(db, id=category_id)
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -148,21 +137,20 @@ async def update_category(
     
     # Check slug uniqueness if being updated
     if category_in.slug and category_in.slug != category.slug:
-        existing = crud_category.category.get_by_slug(db, slug=category_in.slug)
-        if existing:
+        if await crud_category.exists_by_slug(db, slug=category_in.slug):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Category with this slug already exists"
             )
     
-    category = crud_category.category.update(db, db_obj=category, obj_in=category_in)
+    category = await crud_category.update(db, db_obj=category, obj_in=category_in)
     return category
 
 
 @router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_category(
     category_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_admin: dict = Depends(get_current_admin),
 ):
     """
@@ -170,7 +158,7 @@ async def delete_category(
     
     Requires admin authentication
     """
-    category = crud_category.category.get(db, id=category_id)
+    category = await crud_category.get(db, id=category_id)
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -178,9 +166,10 @@ async def delete_category(
         )
     
     # Check if category has products
-    product_count = db.query(func.count(Product.id))\
-        .filter(Product.category_id == category.id)\
-        .scalar()
+    product_count = await db.scalar(
+        select(func.count(Product.id))
+        .where(Product.category_id == category.id)
+    )
     
     if product_count > 0:
         raise HTTPException(
@@ -188,5 +177,5 @@ async def delete_category(
             detail=f"Cannot delete category with {product_count} products. Remove products first."
         )
     
-    crud_category.category.remove(db, id=category_id)
+    await crud_category.delete(db, id=category_id)
     return None
\ No newline at end of file
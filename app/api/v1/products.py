@@ -1,24 +1,31 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from math import ceil
 
+from app.core.cache import cache_get_raw, cache_set_raw, cache_version
 from app.core.dependencies import get_db, get_current_admin
 from app.crud import product as crud_product
+from app.crud.product import FEATURED_PRODUCTS_CACHE
 from app.schemas.product import (
     ProductCreate,
     ProductUpdate,
     ProductResponse,
     ProductWithCategory,
     ProductListResponse,
+    PRODUCT_LIST_ADAPTER,
 )
 
 router = APIRouter()
 
+# Homepage featured list; product writes invalidate it anyway
+FEATURED_PRODUCTS_TTL_SECONDS = 60
+
 
 @router.get("/", response_model=ProductListResponse)
 async def list_products(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     category_id: Optional[int] = Query(None, description="Filter by category ID"),
@@ -28,6 +35,8 @@ async def list_products(
     max_price: Optional[float] = Query(None, ge=0, description="Maximum price (USD)"),
     in_stock: Optional[bool] = Query(None, description="Filter by stock availability"),
     search: Optional[str] = Query(None, max_length=100, description="Search in name and description"),
+    after_price: Optional[float] = Query(None, description="Cursor: price of the last product seen"),
+    after_id: Optional[int] = Query(None, description="Cursor: ID of the last product seen"),
 ):
     """
     Get paginated list of products with filters
@@ -40,14 +49,11 @@ async def list_products(
     - **min_price/max_price**: Price range filter (USD)
     - **in_stock**: Filter by stock availability
     - **search**: Search query for name and description
+    - **after_price/after_id**: Keyset cursor from the previous response's
+      next_after_price/next_after_id; faster than page for deep pages
     """
     skip = (page - 1) * page_size
-    
-    # Get products with filters
-    products = crud_product.product.get_multi_with_filters(
-        db,
-        skip=skip,
-        limit=page_size,
+    filters = dict(
         category_id=category_id,
         is_active=is_active,
         is_featured=is_featured,
@@ -57,32 +63,46 @@ async def list_products(
         search=search,
     )
     
-    # Get total count
-    total = crud_product.product.count_with_filters(
-        db,
-        category_id=category_id,
-        is_active=is_active,
-        is_featured=is_featured,
-        min_price_usd=min_price,
-        max_price_usd=max_price,
-        in_stock=in_stock,
-        search=search,
+    # Half a cursor would otherwise fall back to offset paging and
+    # silently serve the first page again
+    if (after_price is None) != (after_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail="after_price and after_id must be given together",
+        )
+    after = None
+    if after_price is not None:
+        after = (after_price, after_id)
+    
+    # Page and total count come back from a single query (offset paging)
+    products, total = await crud_product.get_multi_with_filters_and_count(
+        db, skip=skip, limit=page_size, after=after, **filters
     )
     
     pages = ceil(total / page_size) if total > 0 else 1
     
-    return {
-        "items": products,
-        "total": total,
-        "page": page,
-        "page_size": page_size,
-        "pages": pages,
-    }
+    # A full page may be followed by more; hand out the cursor for it
+    next_after_price = next_after_id = None
+    if len(products) == page_size:
+        next_after_price, next_after_id = products[-1].price_usd, products[-1].id
+    
+    # pydantic-core writes the JSON bytes directly, so the response skips
+    # FastAPI's re-validation and encoding of the whole page
+    body = ProductListResponse.model_construct(
+        items=[ProductResponse.construct_from_orm(p) for p in products],
+        total=total,
+        page=page,
+        page_size=page_size,
+        pages=pages,
+        next_after_price=next_after_price,
+        next_after_id=next_after_id,
+    ).model_dump_json()
+    return Response(body, media_type="application/json")
 
 
 @router.get("/featured", response_model=List[ProductResponse])
 async def get_featured_products(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     limit: int = Query(10, ge=1, le=50, description="Maximum number of products"),
 ):
     """
@@ -90,19 +110,66 @@ async def get_featured_products(
     
     - **limit**: Maximum number of products to return (1-50)
     """
-    products = crud_product.product.get_featured(db, limit=limit)
-    return products
+    # The cache holds the serialized response body, so a hit is sent
+    # as-is without decoding, re-validating or re-encoding it
+    version = await cache_version(FEATURED_PRODUCTS_CACHE)
+    cache_key = f"{FEATURED_PRODUCTS_CACHE}:v{version}:{limit}"
+    cached = await cache_get_raw(cache_key)
+    if cached is not None:
+        return Response(cached, media_type="application/json")
+    
+    products = await crud_product.get_featured(db, limit=limit)
+    body = PRODUCT_LIST_ADAPTER.dump_json(
+        [ProductResponse.construct_from_orm(p) for p in products]
+    )
+    await cache_set_raw(cache_key, body, FEATURED_PRODUCTS_TTL_SECONDS)
+    return Response(body, media_type="application/json")
+
+
+@router.get("/export")
+async def export_products(
+    db: AsyncSession = Depends(get_db),
+    current_admin: dict = Depends(get_current_admin),
+    category_id: Optional[int] = Query(None, description="Filter by category ID"),
+    is_active: Optional[bool] = Query(None, description="Filter by active status"),
+    is_featured: Optional[bool] = Query(None, description="Filter by featured status"),
+    in_stock: Optional[bool] = Query(None, description="Filter by stock availability"),
+):
+    """
+    Export all matching products as newline-delimited JSON (Admin only)
+    
+    Products are streamed one JSON object per line as they are read, so
+    the export size isn't limited by memory.
+    
+    - **category_id**: Filter by category
+    - **is_active**: Filter by active status (default: all)
+    - **is_featured**: Filter featured products
+    - **in_stock**: Filter by stock availability
+    """
+    products = crud_product.stream_with_filters(
+        db,
+        category_id=category_id,
+        is_active=is_active,
+        is_featured=is_featured,
+        in_stock=in_stock,
+    )
+    
+    async def lines():
+        async for p in products:
+            yield ProductResponse.construct_from_orm(p).model_dump_json() + "\n"
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 @router.get("/{product_id}", response_model=ProductWithCategory)
 async def get_product(
     product_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Get product by ID with category details
     """
-    product = crud_product.product.get(db, id=product_id)
+    product = await crud_product.get_with_category(db, id=product_id)
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -114,12 +181,12 @@ async def get_product(
 @router.get("/slug/{slug}", response_model=ProductWithCategory)
 async def get_product_by_slug(
     slug: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Get product by slug with category details
     """
-    product = crud_product.product.get_by_slug(db, slug=slug)
+    product = await crud_product.get_by_slug(db, slug=slug)
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -131,7 +198,7 @@ async def get_product_by_slug(
 @router.post("/", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
 async def create_product(
     product_in: ProductCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_admin: dict = Depends(get_current_admin),
 ):
     """
@@ -139,24 +206,22 @@ async def create_product(
     
     Requires admin authentication
     """
-    # Check if slug already exists
-    existing = crud_product.product.get_by_slug(db, slug=product_in.slug)
-    if existing:
+    # Check slug and SKU (if provided) uniqueness in one query
+    existing = await crud_product.get_by_slug_or_sku(
+        db, slug=product_in.slug, sku=product_in.sku
+    )
+    if any(row.slug == product_in.slug for row in existing):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Product with this slug already exists"
         )
+    if product_in.sku and any(row.sku == product_in.sku for row in existing):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Product with this SKU already exists"
+        )
     
-    # Check if SKU already exists (if provided)
-    if product_in.sku:
-        existing_sku = crud_product.product.get_by_sku(db, sku=product_in.sku)
-        if existing_sku:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Product with this SKU already exists"
-            )
-    
-    product = crud_product.product.create(db, obj_in=product_in)
+    product = await crud_product.create(db, obj_in=product_in)
     return product
 
 
@@ -164,7 +229,7 @@ async def create_product(
 async def update_product(
     product_id: int,
     product_in: ProductUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_admin: dict = Depends(get_current_admin),
 ):
     """
@@ -172,39 +237,38 @@ async def update_product(
     
     Requires admin authentication
     """
-    product = crud_product.product.get(db, id=product_id)
+    product = await crud_product.get(db, id=product_id)
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found"
         )
     
-    # Check slug uniqueness if being updated
-    if product_in.slug and product_in.slug != product.slug:
-        existing = crud_product.product.get_by_slug(db, slug=product_in.slug)
-        if existing:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Product with this slug already exists"
-            )
-    
-    # Check SKU uniqueness if being updated
-    if product_in.sku and product_in.sku != product.sku:
-        existing_sku = crud_product.product.get_by_sku(db, sku=product_in.sku)
-        if existing_sku:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Product with this SKU already exists"
-            )
-    
-    product = crud_product.product.update(db, db_obj=product, obj_in=product_in)
+    # Check slug and SKU uniqueness if being updated, in one query
+    new_slug = product_in.slug if product_in.slug != product.slug else None
+    new_sku = product_in.sku if product_in.sku != product.sku else None
+    existing = await crud_product.get_by_slug_or_sku(
+        db, slug=new_slug, sku=new_sku, exclude_id=product.id
+    )
+    if new_slug and any(row.slug == new_slug for row in existing):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Product with this slug already exists"
+        )
+    if new_sku and any(row.sku == new_sku for row in existing):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Product with this SKU already exists"
+        )
+    
+    product = await crud_product.update(db, db_obj=product, obj_in=product_in)
     return product
 
 
 @router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_product(
     product_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_admin: dict = Depends(get_current_admin),
 ):
     """
@@ -212,12 +276,12 @@ async def delete_product(
     
     Requires admin authentication
     """
-    product = crud_product.product.get(db, id=product_id)
+    product = await crud_product.get(db, id=product_id)
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found"
         )
     
-    crud_product.product.remove(db, id=product_id)
+    await crud_product.delete(db, id=product_id)
     return None
\ No newline at end of file
@@ -0,0 +1,154 @@
+import json
+import logging
+from typing import Any, Optional
+
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Shared Redis client; caching is disabled when REDIS_URL is not set
+redis_client: Optional[aioredis.Redis] = (
+    aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+    if settings.REDIS_URL
+    else None
+)
+
+# Sentinel returned by cache_get on a miss, so a cached None can be told apart
+MISS = object()
+
+
+async def cache_get(key: str) -> Any:
+    """
+    Get a JSON value from the cache
+    
+    Args:
+        key: Cache key
+    
+    Returns:
+        Decoded value, or MISS if the key is absent or the cache is unavailable
+    """
+    if redis_client is None:
+        return MISS
+    try:
+        raw = await redis_client.get(key)
+    except RedisError:
+        logger.warning("Cache read failed", extra={"key": key}, exc_info=True)
+        return MISS
+    if raw is None:
+        return MISS
+    return json.loads(raw)
+
+
+async def cache_set(key: str, value: Any, ttl: int) -> None:
+    """
+    Store a JSON-serializable value in the cache
+    
+    Args:
+        key: Cache key
+        value: Value to store (None is cached as a negative result)
+        ttl: Time to live in seconds
+    """
+    if redis_client is None:
+        return
+    try:
+        await redis_client.setex(key, ttl, json.dumps(value))
+    except RedisError:
+        logger.warning("Cache write failed", extra={"key": key}, exc_info=True)
+
+
+async def cache_get_raw(key: str) -> Optional[str]:
+    """
+    Get an already serialized JSON document from the cache
+    
+    Unlike cache_get the value is not decoded, so it can be sent as the
+    response body as-is.
+    
+    Args:
+        key: Cache key
+    
+    Returns:
+        Stored JSON text, or None if the key is absent or the cache is unavailable
+    """
+    if redis_client is None:
+        return None
+    try:
+        return await redis_client.get(key)
+    except RedisError:
+        logger.warning("Cache read failed", extra={"key": key}, exc_info=True)
+        return None
+
+
+async def cache_set_raw(key: str, value: bytes, ttl: int) -> None:
+    """
+    Store an already serialized JSON document in the cache
+    
+    Args:
+        key: Cache key
+        value: Serialized JSON
+        ttl: Time to live in seconds
+    """
+    if redis_client is None:
+        return
+    try:
+        await redis_client.setex(key, ttl, value)
+    except RedisError:
+        logger.warning("Cache write failed", extra={"key": key}, exc_info=True)
+
+
+async def cache_delete(*keys: str) -> None:
+    """
+    Remove keys from the cache
+    
+    Args:
+        *keys: Cache keys to delete
+    """
+    if redis_client is None or not keys:
+        return
+    try:
+        await redis_client.delete(*keys)
+    except RedisError:
+        logger.warning("Cache delete failed", extra={"keys": keys}, exc_info=True)
+
+
+async def cache_version(namespace: str) -> int:
+    """
+    Get the current version of a cache namespace
+    
+    Keys built with the version are invalidated all at once by
+    bump_cache_version, without having to find and delete them.
+    
+    Args:
+        namespace: Cache namespace
+    
+    Returns:
+        Namespace version (0 if never bumped or the cache is unavailable)
+    """
+    if redis_client is None:
+        return 0
+    try:
+        version = await redis_client.get(f"{namespace}:version")
+    except RedisError:
+        logger.warning("Cache read failed", extra={"namespace": namespace}, exc_info=True)
+        return 0
+    return int(version or 0)
+
+
+async def bump_cache_version(*namespaces: str) -> None:
+    """
+    Invalidate every key of the given cache namespaces
+    
+    Args:
+        *namespaces: Cache namespaces to invalidate
+    """
+    if redis_client is None or not namespaces:
+        return
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for namespace in namespaces:
+                pipe.incr(f"{namespace}:version")
+            await pipe.execute()
+    except RedisError:
+        logger.warning("Cache invalidation failed", extra={"namespaces": namespaces}, exc_info=True)
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from typing import List, Literal
 
 
 class Settings(BaseSettings):
@@ -13,12 +13,28 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 3600  # seconds before a connection is replaced
+    DB_USE_NULL_POOL: bool = False  # set when pooling is done by pgbouncer
+    DB_QUERY_CACHE_SIZE: int = 1200  # compiled SQL statements kept per engine
+    
+    # Redis (cache); caching is disabled when empty
+    REDIS_URL: str = ""
     
     # JWT
     JWT_SECRET_KEY: str
-    JWT_ALGORITHM: str = "HS256"
+    JWT_ALGORITHM: Literal["HS256", "HS384", "HS512"] = "HS256"  # HMAC only (see security.py)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Password hashing (Argon2id); defaults are the OWASP minimum,
+    # run argon2_calibrate.py to size them for the deployment hardware
+    ARGON2_MEMORY_COST: int = 19456  # KiB
+    ARGON2_TIME_COST: int = 2
+    ARGON2_PARALLELISM: int = 1
+    PASSWORD_HASH_WORKERS: int = 0  # threads hashing passwords; 0 = one per CPU
+    
     # CORS
     CORS_ORIGINS: List[str] = ["http://localhost:3000"]
     
@@ -1,8 +1,13 @@
-from typing import Generator, Optional
+import hashlib
+import time
+from datetime import datetime, timezone
+from typing import AsyncGenerator, Optional
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
-from sqlalchemy.orm import Session
+import jwt
+from jwt import PyJWTError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.database import SessionLocal
@@ -12,23 +17,82 @@ from app.crud import user as crud_user
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+# jwt.decode arguments, built once at import so the auth path doesn't
+# re-read settings or allocate the algorithms list/options per request
+# (key pre-encoded so PyJWT doesn't convert it on every decode)
+_JWT_DECODE_KWARGS = {
+    "key": settings.JWT_SECRET_KEY.encode(),
+    "algorithms": [settings.JWT_ALGORITHM],
+    "options": {"require": ["exp", "sub"]},
+}
 
-def get_db() -> Generator:
+# Validated tokens -> (expiry timestamp, detached user), so repeated requests
+# with the same token skip both JWT decoding and the user lookup
+TOKEN_CACHE_TTL_SECONDS = 60
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=TOKEN_CACHE_TTL_SECONDS)
+# User ID -> keys of that user's cached tokens, so invalidation needn't scan
+# the cache; refreshed with every entry added, so it outlives them
+_user_token_keys: TTLCache = TTLCache(maxsize=10_000, ttl=TOKEN_CACHE_TTL_SECONDS)
+
+
+def _token_cache_key(token: str) -> bytes:
+    """Short digest of the token used as cache key"""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def invalidate_user_cache(user_id: int) -> None:
+    """
+    Drop cached token entries for a user
+    
+    Called by crud_user.update, so the next request in this process reloads
+    the user. Other worker processes keep their entries until they expire
+    (at most TOKEN_CACHE_TTL_SECONDS).
+    
+    Args:
+        user_id: User ID
+    """
+    for key in _user_token_keys.pop(user_id, ()):
+        _token_cache.pop(key, None)
+
+
+def _cache_token_user(key: bytes, exp: int, user: User) -> None:
+    """Cache a validated token's user and index the entry by user ID"""
+    _token_cache[key] = (exp, user)
+    # Drop keys of entries that have expired or been evicted meanwhile
+    keys = {k for k in _user_token_keys.get(user.id, ()) if k in _token_cache}
+    keys.add(key)
+    _user_token_keys[user.id] = keys
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Database session dependency
     
+    FastAPI caches dependencies per request, so the auth chain and the route
+    share this one session (and at most one pooled connection).
+    
     Yields:
-        Database session
+        Async database session
     """
-    db = SessionLocal()
-    try:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+
+def current_utc_now() -> datetime:
+    """
+    Current time dependency (timezone-aware UTC)
+    
+    FastAPI caches dependency results per request, so every check in one
+    request sees the same timestamp.
+    
+    Returns:
+        Current UTC datetime
+    """
+    return datetime.now(timezone.utc)
 
 
 async def get_current_user(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     token: str = Depends(oauth2_scheme)
 ) -> User:
     """
@@ -50,23 +114,29 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
+    cache_key = _token_cache_key(token)
+    cached = _token_cache.get(cache_key)
+    if cached is not None and cached[0] > time.time():
+        # Attach a copy of the cached user to this session without a SELECT
+        return await db.merge(cached[1], load=False)
+    
     try:
-        payload = jwt.decode(
-            token, 
-            settings.JWT_SECRET_KEY, 
-            algorithms=[settings.JWT_ALGORITHM]
-        )
+        payload = jwt.decode(token, **_JWT_DECODE_KWARGS)
         user_id: str = payload.get("sub")
         if user_id is None:
             raise credentials_exception
-    except JWTError:
+    except PyJWTError:
         raise credentials_exception
     
-    user = crud_user.get(db, id=int(user_id))
+    user = await crud_user.get(db, id=int(user_id))
     if user is None:
         raise credentials_exception
     
-    return user
+    # Cache a detached instance; the request works on a session-bound copy
+    db.expunge(user)
+    _cache_token_user(cache_key, payload["exp"], user)
+    
+    return await db.merge(user, load=False)
 
 
 async def get_current_active_user(
@@ -1,14 +1,62 @@
-import resend
-from typing import Optional
+import asyncio
+import logging
+import uuid
+from functools import lru_cache
+import httpx
+from typing import List, Optional
 from pathlib import Path
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
 
 from app.core.config import settings
 
-# Configure Resend with API key
-resend.api_key = settings.RESEND_API_KEY
+logger = logging.getLogger(__name__)
 
+RESEND_API_URL = "https://api.resend.com"
 
-def send_email(
+EMAIL_TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates" / "email"
+
+
+@lru_cache(maxsize=None)
+def _get_template(name: str) -> Template:
+    """
+    Return a compiled email template
+    
+    Templates are compiled on first use and then reused, so processes that
+    never send email don't pay for it. HTML templates are autoescaped so
+    user-supplied names can't inject markup.
+    """
+    return _template_env().get_template(name)
+
+
+@lru_cache(maxsize=1)
+def _template_env() -> Environment:
+    """Jinja2 environment for the email templates"""
+    return Environment(
+        loader=FileSystemLoader(EMAIL_TEMPLATE_DIR),
+        autoescape=select_autoescape(["html"]),
+        auto_reload=False,
+    )
+
+# One HTTP/2 client for all Resend calls, so the TLS connection is kept
+# alive and concurrent sends are multiplexed instead of handshaking per email
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Return the shared Resend API client, creating it on first use"""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            base_url=RESEND_API_URL,
+            http2=True,
+            headers={"Authorization": f"Bearer {settings.RESEND_API_KEY}"},
+            limits=httpx.Limits(max_keepalive_connections=20),
+            timeout=10.0,
+        )
+    return _http_client
+
+
+def build_email_params(
     *,
     email_to: str,
     subject: str,
@@ -16,7 +64,7 @@ def send_email(
     text_content: Optional[str] = None,
 ) -> dict:
     """
-    Send email using Resend API
+    Build the Resend API parameters for one email
     
     Args:
         email_to: Recipient email address
@@ -25,38 +73,29 @@ def send_email(
         text_content: Plain text fallback (optional)
     
     Returns:
-        Response from Resend API
-    
-    Raises:
-        Exception: If email sending fails
+        Resend email parameters
     """
-    try:
-        params = {
-            "from": f"{settings.EMAIL_FROM_NAME} <{settings.EMAIL_FROM}>",
-            "to": [email_to],
-            "subject": subject,
-            "html": html_content,
-        }
-        
-        if text_content:
-            params["text"] = text_content
-        
-        response = resend.Emails.send(params)
-        return response
+    params = {
+        "from": f"{settings.EMAIL_FROM_NAME} <{settings.EMAIL_FROM}>",
+        "to": [email_to],
+        "subject": subject,
+        "html": html_content,
+    }
+    
+    if text_content:
+        params["text"] = text_content
     
-    except Exception as e:
-        print(f"Error sending email to {email_to}: {str(e)}")
-        raise
+    return params
 
 
-def send_verification_email(
+def build_verification_email(
     *,
     email_to: str,
     username: str,
     token: str,
 ) -> dict:
     """
-    Send verification email with token link
+    Build verification email with token link
     
     Args:
         email_to: Recipient email address
@@ -64,128 +103,22 @@ def send_verification_email(
         token: Verification token
     
     Returns:
-        Response from Resend API
+        Resend email parameters
     """
     subject = f"{settings.EMAIL_FROM_NAME} - Verify your email address"
     
     # Construct verification link
     verification_link = f"{settings.FRONTEND_URL}/verify-email?token={token}"
     
-    # HTML email content
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="utf-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Verify Your Email</title>
-        <style>
-            body {{
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
-                line-height: 1.6;
-                color: #333;
-                max-width: 600px;
-                margin: 0 auto;
-                padding: 20px;
-            }}
-            .container {{
-                background-color: #ffffff;
-                border-radius: 8px;
-                padding: 40px;
-                box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-            }}
-            .header {{
-                text-align: center;
-                margin-bottom: 30px;
-            }}
-            .header h1 {{
-                color: #2563eb;
-                margin: 0;
-                font-size: 28px;
-            }}
-            .content {{
-                margin-bottom: 30px;
-            }}
-            .button {{
-                display: inline-block;
-                padding: 14px 32px;
-                background-color: #2563eb;
-                color: #ffffff !important;
-                text-decoration: none;
-                border-radius: 6px;
-                font-weight: 600;
-                text-align: center;
-                margin: 20px 0;
-            }}
-            .button:hover {{
-                background-color: #1d4ed8;
-            }}
-            .footer {{
-                margin-top: 40px;
-                padding-top: 20px;
-                border-top: 1px solid #e5e7eb;
-                font-size: 14px;
-                color: #6b7280;
-                text-align: center;
-            }}
-            .link {{
-                color: #2563eb;
-                word-break: break-all;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>🎉 Welcome to {settings.EMAIL_FROM_NAME}!</h1>
-            </div>
-            
-            <div class="content">
-                <p>Hi {username},</p>
-                
-                <p>Thank you for registering with {settings.EMAIL_FROM_NAME}! We're excited to have you on board.</p>
-                
-                <p>To complete your registration and verify your email address, please click the button below:</p>
-                
-                <div style="text-align: center;">
-                    <a href="{verification_link}" class="button">Verify Email Address</a>
-                </div>
-                
-                <p>Or copy and paste this link into your browser:</p>
-                <p class="link">{verification_link}</p>
-                
-                <p><strong>This link will expire in 24 hours.</strong></p>
-                
-                <p>If you didn't create an account with us, you can safely ignore this email.</p>
-            </div>
-            
-            <div class="footer">
-                <p>© 2024 {settings.EMAIL_FROM_NAME}. All rights reserved.</p>
-                <p>If you have any questions, feel free to contact our support team.</p>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
-    
-    # Plain text fallback
-    text_content = f"""
-    Welcome to {settings.EMAIL_FROM_NAME}!
-    
-    Hi {username},
-    
-    Thank you for registering! To verify your email address, please click the link below:
-    
-    {verification_link}
+    context = {
+        "brand": settings.EMAIL_FROM_NAME,
+        "username": username,
+        "verification_link": verification_link,
+    }
+    html_content = _get_template("verify.html").render(context)
+    text_content = _get_template("verify.txt").render(context)
     
-    This link will expire in 24 hours.
-    
-    If you didn't create an account with us, you can safely ignore this email.
-    
-    © 2024 {settings.EMAIL_FROM_NAME}
-    """
-    
-    return send_email(
+    return build_email_params(
         email_to=email_to,
         subject=subject,
         html_content=html_content,
@@ -193,75 +126,179 @@ def send_verification_email(
     )
 
 
-def send_welcome_email(
+def build_welcome_email(
     *,
     email_to: str,
     username: str,
 ) -> dict:
     """
-    Send welcome email after successful verification
+    Build welcome email sent after successful verification
     
     Args:
         email_to: Recipient email address
         username: User's name
     
     Returns:
-        Response from Resend API
+        Resend email parameters
     """
     subject = f"Welcome to {settings.EMAIL_FROM_NAME}!"
     
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="utf-8">
-        <title>Welcome!</title>
-        <style>
-            body {{
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                line-height: 1.6;
-                color: #333;
-                max-width: 600px;
-                margin: 0 auto;
-                padding: 20px;
-            }}
-            .container {{
-                background-color: #ffffff;
-                border-radius: 8px;
-                padding: 40px;
-                box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-            }}
-            h1 {{
-                color: #2563eb;
-                text-align: center;
-            }}
-            .button {{
-                display: inline-block;
-                padding: 14px 32px;
-                background-color: #2563eb;
-                color: #ffffff !important;
-                text-decoration: none;
-                border-radius: 6px;
-                margin: 20px 0;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1>✅ Email Verified!</h1>
-            <p>Hi {username},</p>
-            <p>Your email has been successfully verified. You can now enjoy all features of {settings.EMAIL_FROM_NAME}!</p>
-            <div style="text-align: center;">
-                <a href="{settings.FRONTEND_URL}" class="button">Start Shopping</a>
-            </div>
-            <p>Happy shopping!</p>
-        </div>
-    </body>
-    </html>
-    """
+    html_content = _get_template("welcome.html").render(
+        brand=settings.EMAIL_FROM_NAME,
+        username=username,
+        frontend_url=settings.FRONTEND_URL,
+    )
     
-    return send_email(
+    return build_email_params(
         email_to=email_to,
         subject=subject,
         html_content=html_content,
     )
+
+
+# Batched delivery: requests put emails on a queue and return immediately;
+# a few workers coalesce whatever is queued into Resend batch API calls
+EMAIL_BATCH_SIZE = 20  # Resend accepts up to 100 emails per batch call
+EMAIL_BATCH_WAIT_SECONDS = 0.05  # how long a worker waits to fill a batch
+EMAIL_WORKER_COUNT = 2
+EMAIL_SHUTDOWN_TIMEOUT_SECONDS = 10  # time given to send what is queued on shutdown
+EMAIL_BATCH_ATTEMPTS = 2  # tries per batch on timeouts and 5xx responses
+
+_email_queue: Optional[asyncio.Queue] = None
+_email_workers: List[asyncio.Task] = []
+
+
+async def _email_worker(queue: asyncio.Queue) -> None:
+    """Send queued emails in batches until cancelled"""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await queue.get()]
+        deadline = loop.time() + EMAIL_BATCH_WAIT_SECONDS
+        while len(batch) < EMAIL_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        
+        try:
+            await _send_batch(batch)
+        finally:
+            for _ in batch:
+                queue.task_done()
+
+
+async def _send_batch(batch: List[dict]) -> None:
+    """
+    Send a batch of emails
+    
+    A batch rejected with a 4xx (e.g. one bad address) was not sent, so its
+    emails are sent one at a time and only those that fail on their own are
+    lost. Timeouts and 5xx responses may come after Resend accepted the
+    batch, so those are only retried as the same batch under one
+    Idempotency-Key, which Resend delivers at most once; if that fails too
+    the batch is logged and dropped rather than risk duplicate emails.
+    """
+    client = _get_http_client()
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+    recipients = [params["to"][0] for params in batch]
+    for attempt in range(1, EMAIL_BATCH_ATTEMPTS + 1):
+        try:
+            response = await client.post("/emails/batch", json=batch, headers=headers)
+            response.raise_for_status()
+            return
+        except httpx.HTTPStatusError as exc:
+            # 409: the idempotency key is still in use by the earlier attempt
+            code = exc.response.status_code
+            if 400 <= code < 500 and code != 409:
+                rejected = exc
+                break
+            logger.warning(
+                "Error sending email batch",
+                exc_info=True,
+                extra={"email_to": recipients, "attempt": attempt},
+            )
+        except httpx.TransportError:
+            logger.warning(
+                "Error sending email batch",
+                exc_info=True,
+                extra={"email_to": recipients, "attempt": attempt},
+            )
+        except Exception:
+            logger.exception("Email batch dropped", extra={"email_to": recipients})
+            return
+    else:
+        logger.error("Email batch dropped", extra={"email_to": recipients})
+        return
+    
+    # Rejected batch: nothing was sent, so each email gets its own call
+    logger.warning(
+        "Email batch rejected, sending one at a time",
+        exc_info=rejected,
+        extra={"email_to": recipients},
+    )
+    for params in batch:
+        try:
+            response = await client.post("/emails", json=params)
+            response.raise_for_status()
+        except Exception:
+            logger.exception(
+                "Error sending email",
+                extra={"email_to": params["to"][0], "subject": params["subject"]},
+            )
+
+
+def start_email_workers() -> None:
+    """Create the email queue and start its workers (idempotent)"""
+    global _email_queue
+    if _email_workers:
+        return
+    _email_queue = asyncio.Queue()
+    for _ in range(EMAIL_WORKER_COUNT):
+        _email_workers.append(asyncio.create_task(_email_worker(_email_queue)))
+
+
+async def stop_email_workers() -> None:
+    """Send what is still queued, then cancel the workers and close the client"""
+    global _http_client
+    if _email_queue is not None and _email_workers:
+        try:
+            await asyncio.wait_for(_email_queue.join(), EMAIL_SHUTDOWN_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logger.error(
+                "Email queue not drained on shutdown",
+                extra={"pending": _email_queue.qsize()},
+            )
+    for task in _email_workers:
+        task.cancel()
+    await asyncio.gather(*_email_workers, return_exceptions=True)
+    _email_workers.clear()
+    
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+async def queue_email(params: dict) -> None:
+    """
+    Queue an email for batched delivery
+    
+    Args:
+        params: Resend email parameters, see build_email_params
+    """
+    start_email_workers()
+    await _email_queue.put(params)
+
+
+async def queue_verification_email(*, email_to: str, username: str, token: str) -> None:
+    """Queue verification email with token link"""
+    await queue_email(
+        build_verification_email(email_to=email_to, username=username, token=token)
+    )
+
+
+async def queue_welcome_email(*, email_to: str, username: str) -> None:
+    """Queue welcome email sent after successful verification"""
+    await queue_email(build_welcome_email(email_to=email_to, username=username))
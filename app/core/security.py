@@ -1,22 +1,91 @@
-from datetime import datetime, timedelta
+import asyncio
+import hashlib
+import hmac
+import os
+import time
+from base64 import urlsafe_b64encode
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import lru_cache
 from typing import Any, Union, Optional
-from jose import jwt
-from passlib.context import CryptContext
+import orjson
+from argon2 import PasswordHasher, Type
+from argon2.exceptions import InvalidHashError, VerifyMismatchError
 
 from app.core.config import settings
 
-# Password hashing context - Argon2id configuration
-# Based on OWASP recommendations for Argon2id:
+# Password hasher - Argon2id configuration
+# Defaults follow the OWASP recommendations for Argon2id:
 # - memory_cost: 19456 KiB (19 MiB)
 # - time_cost: 2 iterations
 # - parallelism: 1 thread
-pwd_context = CryptContext(
-    schemes=["argon2"],
-    deprecated="auto",
-    argon2__memory_cost=19456,
-    argon2__time_cost=2,
-    argon2__parallelism=1,
-    argon2__type="ID"  # Argon2id variant (recommended)
+# and can be raised per deployment with argon2_calibrate.py. Existing hashes
+# keep verifying after a change since their parameters are stored in them.
+# argon2-cffi is used directly (not through passlib) to avoid the extra
+# dispatch on every call; existing passlib hashes use the same PHC format.
+# Built on first use, so processes that never hash (migrations, scripts)
+# don't pay for it
+@lru_cache(maxsize=1)
+def get_password_hasher() -> PasswordHasher:
+    """Return the shared Argon2id password hasher"""
+    return PasswordHasher(
+        time_cost=settings.ARGON2_TIME_COST,
+        memory_cost=settings.ARGON2_MEMORY_COST,
+        parallelism=settings.ARGON2_PARALLELISM,
+        hash_len=32,
+        salt_len=16,
+        type=Type.ID,  # Argon2id variant (recommended)
+    )
+
+
+# Argon2 runs on its own pool, one thread per CPU by default, so a burst of
+# logins queues there instead of filling the default executor shared with
+# every other asyncio.to_thread call
+_hash_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_hash_executor() -> ThreadPoolExecutor:
+    """Return the password hashing pool, creating it on first use"""
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS or os.cpu_count(),
+            thread_name_prefix="password-hash",
+        )
+    return _hash_executor
+
+
+def shutdown_hash_executor() -> None:
+    """Wait for running hashes to finish and stop the pool"""
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=True)
+        _hash_executor = None
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    """Check a password, treating a mismatch or malformed hash as False"""
+    try:
+        return get_password_hasher().verify(hashed_password, plain_password)
+    except (VerifyMismatchError, InvalidHashError):
+        return False
+
+
+def _b64url(data: bytes) -> bytes:
+    """Base64url-encode without padding, as JWS requires"""
+    return urlsafe_b64encode(data).rstrip(b"=")
+
+
+# Access tokens are HMAC-signed JWTs with a fixed header, so the header is
+# encoded once and the keyed HMAC state is built once and copied per token
+# instead of re-deriving the key on every encode. Tokens are decoded with
+# PyJWT (see dependencies.get_current_user).
+_JWT_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+_JWT_SIGNING_INPUT_PREFIX = _b64url(
+    orjson.dumps({"alg": settings.JWT_ALGORITHM, "typ": "JWT"})
+) + b"."
+_JWT_HMAC = hmac.new(
+    settings.JWT_SECRET_KEY.encode(), digestmod=_JWT_DIGESTS[settings.JWT_ALGORITHM]
 )
 
 
@@ -33,26 +102,25 @@ def create_access_token(
     Returns:
         Encoded JWT token
     """
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(
-            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-        )
+    if expires_delta is None:
+        expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    expire = int(time.time() + expires_delta.total_seconds())
     
-    to_encode = {"exp": expire, "sub": str(subject)}
-    encoded_jwt = jwt.encode(
-        to_encode, 
-        settings.JWT_SECRET_KEY, 
-        algorithm=settings.JWT_ALGORITHM
+    signing_input = _JWT_SIGNING_INPUT_PREFIX + _b64url(
+        orjson.dumps({"exp": expire, "sub": str(subject)})
     )
-    return encoded_jwt
+    mac = _JWT_HMAC.copy()
+    mac.update(signing_input)
+    return (signing_input + b"." + _b64url(mac.digest())).decode()
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against a hash
     
+    Argon2 is deliberately slow CPU work, so it runs on the password
+    hashing pool instead of blocking the event loop.
+    
     Args:
         plain_password: Plain text password
         hashed_password: Hashed password from database
@@ -60,12 +128,14 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return await asyncio.get_running_loop().run_in_executor(
+        _get_hash_executor(), _verify, plain_password, hashed_password
+    )
 
 
-def get_password_hash(password: str) -> str:
+async def get_password_hash(password: str) -> str:
     """
-    Hash a password
+    Hash a password (on the password hashing pool, see verify_password)
     
     Args:
         password: Plain text password
@@ -73,4 +143,42 @@ def get_password_hash(password: str) -> str:
     Returns:
         Hashed password
     """
-    return pwd_context.hash(password)
+    return await asyncio.get_running_loop().run_in_executor(
+        _get_hash_executor(), get_password_hasher().hash, password
+    )
+
+
+def hash_verification_token(token: str) -> bytes:
+    """
+    Hash a verification token for storage and lookup
+    
+    Only the HMAC-SHA256 digest is stored, so a leaked database doesn't
+    yield usable tokens, and lookups compare a fixed 32-byte key.
+    
+    Args:
+        token: Raw token string sent to the user
+    
+    Returns:
+        32-byte digest
+    """
+    return hmac.new(
+        settings.JWT_SECRET_KEY.encode(), token.encode(), hashlib.sha256
+    ).digest()
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Check if a hash was made with different parameters than the current ones
+    
+    Only parses the hash string, so it is cheap enough to call inline.
+    
+    Args:
+        hashed_password: Hashed password from database
+    
+    Returns:
+        True if the password should be hashed again
+    """
+    try:
+        return get_password_hasher().check_needs_rehash(hashed_password)
+    except InvalidHashError:
+        return True
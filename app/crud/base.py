@@ -1,7 +1,8 @@
 from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.base import Base
 
@@ -22,32 +23,33 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         self.model = model
     
-    def get(self, db: Session, id: Any) -> Optional[ModelType]:
+    async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
         """Get a single record by ID"""
-        return db.query(self.model).filter(self.model.id == id).first()
+        return await db.get(self.model, id)
     
-    def get_multi(
+    async def get_multi(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         skip: int = 0, 
         limit: int = 100
     ) -> List[ModelType]:
         """Get multiple records with pagination"""
-        return db.query(self.model).offset(skip).limit(limit).all()
+        result = await db.execute(select(self.model).offset(skip).limit(limit))
+        return list(result.scalars().all())
     
-    def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
+    async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
         """Create a new record"""
         obj_in_data = jsonable_encoder(obj_in)
         db_obj = self.model(**obj_in_data)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
         return db_obj
     
-    def update(
+    async def update(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         db_obj: ModelType,
         obj_in: Union[UpdateSchemaType, Dict[str, Any]]
@@ -65,17 +67,18 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 setattr(db_obj, field, update_data[field])
         
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
         return db_obj
     
-    def delete(self, db: Session, *, id: int) -> ModelType:
+    async def delete(self, db: AsyncSession, *, id: int) -> ModelType:
         """Delete a record"""
-        obj = db.query(self.model).get(id)
-        db.delete(obj)
-        db.commit()
+        obj = await db.get(self.model, id)
+        await db.delete(obj)
+        await db.commit()
         return obj
     
-    def count(self, db: Session) -> int:
+    async def count(self, db: AsyncSession) -> int:
         """Count total records"""
-        return db.query(self.model).count()
+        result = await db.execute(select(func.count()).select_from(self.model))
+        return result.scalar_one()
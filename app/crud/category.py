@@ -1,15 +1,25 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional, Union
+from sqlalchemy import bindparam, exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import bump_cache_version
 from app.crud.base import CRUDBase
 from app.models.category import Category
 from app.schemas.category import CategoryCreate, CategoryUpdate
 
+# Slug lookups, built once and executed with the slug as a bound parameter
+_get_by_slug_stmt = select(Category).where(Category.slug == bindparam("slug"))
+_exists_by_slug_stmt = select(exists().where(Category.slug == bindparam("slug")))
+
+# Cache namespace of the storefront category list (see api/v1/categories.py);
+# bumped on every category write
+ACTIVE_CATEGORIES_CACHE = "categories:active"
+
 
 class CRUDCategory(CRUDBase[Category, CategoryCreate, CategoryUpdate]):
     """CRUD operations for Category model"""
     
-    def get_by_slug(self, db: Session, *, slug: str) -> Optional[Category]:
+    async def get_by_slug(self, db: AsyncSession, *, slug: str) -> Optional[Category]:
         """
         Get category by slug
         
@@ -20,9 +30,23 @@ class CRUDCategory(CRUDBase[Category, CategoryCreate, CategoryUpdate]):
         Returns:
             Category object or None
         """
-        return db.query(Category).filter(Category.slug == slug).first()
+        result = await db.execute(_get_by_slug_stmt, {"slug": slug})
+        return result.scalar_one_or_none()
+    
+    async def exists_by_slug(self, db: AsyncSession, *, slug: str) -> bool:
+        """
+        Check if a category with this slug exists
+        
+        Args:
+            db: Database session
+            slug: Category slug
+        
+        Returns:
+            True if the slug is taken
+        """
+        return await db.scalar(_exists_by_slug_stmt, {"slug": slug})
     
-    def get_active(self, db: Session, *, skip: int = 0, limit: int = 100) -> List[Category]:
+    async def get_active(self, db: AsyncSession, *, skip: int = 0, limit: int = 100) -> List[Category]:
         """
         Get active categories
         
@@ -34,11 +58,37 @@ class CRUDCategory(CRUDBase[Category, CategoryCreate, CategoryUpdate]):
         Returns:
             List of active categories
         """
-        return db.query(Category)\
-            .filter(Category.is_active == True)\
-            .offset(skip)\
-            .limit(limit)\
-            .all()
+        result = await db.execute(
+            select(Category)
+            .where(Category.is_active == True)
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+    
+    async def create(self, db: AsyncSession, *, obj_in: CategoryCreate) -> Category:
+        """Create a category and invalidate the cached category list"""
+        db_obj = await super().create(db, obj_in=obj_in)
+        await bump_cache_version(ACTIVE_CATEGORIES_CACHE)
+        return db_obj
+    
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: Category,
+        obj_in: Union[CategoryUpdate, Dict[str, Any]]
+    ) -> Category:
+        """Update a category and invalidate the cached category list"""
+        db_obj = await super().update(db, db_obj=db_obj, obj_in=obj_in)
+        await bump_cache_version(ACTIVE_CATEGORIES_CACHE)
+        return db_obj
+    
+    async def delete(self, db: AsyncSession, *, id: int) -> Category:
+        """Delete a category and invalidate the cached category list"""
+        db_obj = await super().delete(db, id=id)
+        await bump_cache_version(ACTIVE_CATEGORIES_CACHE)
+        return db_obj
 
 
 category = CRUDCategory(Category)
@@ -1,16 +1,45 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+from sqlalchemy import Row, bindparam, select, func, or_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
+from app.core.cache import bump_cache_version
 from app.crud.base import CRUDBase
+from app.crud.category import ACTIVE_CATEGORIES_CACHE
 from app.models.product import Product
 from app.schemas.product import ProductCreate, ProductUpdate
 
+# Unique-key lookups, built once; slug/sku are bound on each execute
+_get_by_slug_stmt = (
+    select(Product)
+    .options(selectinload(Product.category))
+    .where(Product.slug == bindparam("slug"))
+)
+_get_by_sku_stmt = select(Product).where(Product.sku == bindparam("sku"))
+
+# Cache namespace of the featured product list (see api/v1/products.py).
+# Product writes also bump the category list, which carries product counts.
+FEATURED_PRODUCTS_CACHE = "products:featured"
+_PRODUCT_CACHES = (FEATURED_PRODUCTS_CACHE, ACTIVE_CATEGORIES_CACHE)
+
 
 class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
     """CRUD operations for Product model"""
     
-    def get_by_slug(self, db: Session, *, slug: str) -> Optional[Product]:
+    async def get_with_category(self, db: AsyncSession, *, id: int) -> Optional[Product]:
+        """
+        Get product by ID with its category loaded
+        
+        Args:
+            db: Database session
+            id: Product ID
+        
+        Returns:
+            Product object or None
+        """
+        return await db.get(Product, id, options=[selectinload(Product.category)])
+    
+    async def get_by_slug(self, db: AsyncSession, *, slug: str) -> Optional[Product]:
         """
         Get product by slug
         
@@ -21,9 +50,10 @@ class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
         Returns:
             Product object or None
         """
-        return db.query(Product).filter(Product.slug == slug).first()
+        result = await db.execute(_get_by_slug_stmt, {"slug": slug})
+        return result.scalar_one_or_none()
     
-    def get_by_sku(self, db: Session, *, sku: str) -> Optional[Product]:
+    async def get_by_sku(self, db: AsyncSession, *, sku: str) -> Optional[Product]:
         """
         Get product by SKU
         
@@ -34,14 +64,48 @@ class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
         Returns:
             Product object or None
         """
-        return db.query(Product).filter(Product.sku == sku).first()
+        result = await db.execute(_get_by_sku_stmt, {"sku": sku})
+        return result.scalar_one_or_none()
     
-    def get_multi_with_filters(
+    async def get_by_slug_or_sku(
+        self,
+        db: AsyncSession,
+        *,
+        slug: Optional[str] = None,
+        sku: Optional[str] = None,
+        exclude_id: Optional[int] = None,
+    ) -> List[Row]:
+        """
+        Find products clashing with a slug or SKU in a single query
+        
+        Args:
+            db: Database session
+            slug: Product slug to check
+            sku: Product SKU to check
+            exclude_id: Product ID to ignore (the product being updated)
+        
+        Returns:
+            Rows of (id, slug, sku) for matching products; at most two since
+            both columns are unique
+        """
+        conditions = []
+        if slug:
+            conditions.append(Product.slug == slug)
+        if sku:
+            conditions.append(Product.sku == sku)
+        if not conditions:
+            return []
+        
+        query = select(Product.id, Product.slug, Product.sku).where(or_(*conditions))
+        if exclude_id is not None:
+            query = query.where(Product.id != exclude_id)
+        
+        result = await db.execute(query.limit(2))
+        return list(result.all())
+    
+    def _filter_conditions(
         self,
-        db: Session,
         *,
-        skip: int = 0,
-        limit: int = 100,
         category_id: Optional[int] = None,
         is_active: Optional[bool] = True,
         is_featured: Optional[bool] = None,
@@ -49,75 +113,121 @@ class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
         max_price_usd: Optional[float] = None,
         in_stock: Optional[bool] = None,
         search: Optional[str] = None,
-    ) -> List[Product]:
+    ) -> list:
         """
-        Get products with filters and pagination
+        Build the WHERE conditions for product listing filters
         
         Args:
-            db: Database session
-            skip: Offset for pagination
-            limit: Limit for pagination
-            category_id: Filter by category ID
-            is_active: Filter by active status
-            is_featured: Filter by featured status
-            min_price_usd: Minimum price in USD
-            max_price_usd: Maximum price in USD
-            in_stock: Filter by stock availability
-            search: Search in name and description
+            Same as get_multi_with_filters
         
         Returns:
-            List of products
+            List of SQL conditions
         """
-        query = db.query(Product)
+        conditions = []
         
         # Filter by active status
         if is_active is not None:
-            query = query.filter(Product.is_active == is_active)
+            conditions.append(Product.is_active == is_active)
         
         # Filter by category
         if category_id:
-            query = query.filter(Product.category_id == category_id)
+            conditions.append(Product.category_id == category_id)
         
         # Filter by featured
         if is_featured is not None:
-            query = query.filter(Product.is_featured == is_featured)
+            conditions.append(Product.is_featured == is_featured)
         
         # Filter by price range
         if min_price_usd is not None:
-            query = query.filter(Product.price_usd >= min_price_usd)
+            conditions.append(Product.price_usd >= min_price_usd)
         if max_price_usd is not None:
-            query = query.filter(Product.price_usd <= max_price_usd)
+            conditions.append(Product.price_usd <= max_price_usd)
         
         # Filter by stock
         if in_stock is not None:
             if in_stock:
-                query = query.filter(Product.stock > 0)
+                conditions.append(Product.stock > 0)
             else:
-                query = query.filter(Product.stock == 0)
+                conditions.append(Product.stock == 0)
         
-        # Search in name and description
+        # Search in name and description: whole words via full-text search,
+        # partial words ("lapt") via ILIKE; both are served by GIN indexes
         if search:
-            search_filter = or_(
-                Product.name.ilike(f"%{search}%"),
-                Product.description.ilike(f"%{search}%"),
+            conditions.append(
+                or_(
+                    Product.search_vec.match(search, postgresql_regconfig="english"),
+                    Product.name.ilike(f"%{search}%"),
+                    Product.description.ilike(f"%{search}%"),
+                )
             )
-            query = query.filter(search_filter)
         
-        # Pagination
-        return query.offset(skip).limit(limit).all()
+        return conditions
     
-    def count_with_filters(
+    async def get_multi_with_filters(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
-        category_id: Optional[int] = None,
-        is_active: Optional[bool] = True,
-        is_featured: Optional[bool] = None,
-        min_price_usd: Optional[float] = None,
-        max_price_usd: Optional[float] = None,
-        in_stock: Optional[bool] = None,
-        search: Optional[str] = None,
-    ) -> int:
+        skip: int = 0,
+        limit: int = 100,
+        with_category: bool = False,
+        **filters,
+    ) -> List[Product]:
+        """
+        Get products with filters and pagination
+        
+        Args:
+            db: Database session
+            skip: Offset for pagination
+            limit: Limit for pagination
+            with_category: Batch-load each product's category (one IN query)
+            category_id: Filter by category ID
+            is_active: Filter by active status
+            is_featured: Filter by featured status
+            min_price_usd: Minimum price in USD
+            max_price_usd: Maximum price in USD
+            in_stock: Filter by stock availability
+            search: Search in name and description
+        
+        Returns:
+            List of products
+        """
+        query = select(Product).where(*self._filter_conditions(**filters))
+        if with_category:
+            query = query.options(selectinload(Product.category))
+        result = await db.execute(query.offset(skip).limit(limit))
+        return list(result.scalars().all())
+    
+    async def stream_with_filters(
+        self,
+        db: AsyncSession,
+        *,
+        batch_size: int = 100,
+        **filters,
+    ) -> AsyncIterator[Product]:
+        """
+        Iterate over all filtered products without loading them at once
+        
+        Rows are fetched from a server-side cursor batch_size at a time
+        (yield_per), so memory stays flat however many products match.
+        
+        Args:
+            db: Database session
+            batch_size: Rows fetched per round trip
+            **filters: Same filters as get_multi_with_filters
+        
+        Yields:
+            Products ordered by ID
+        """
+        result = await db.stream_scalars(
+            select(Product)
+            .where(*self._filter_conditions(**filters))
+            .order_by(Product.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for product in result:
+            yield product
+    
+    async def count_with_filters(self, db: AsyncSession, **filters) -> int:
         """
         Count products with filters
         
@@ -127,48 +237,129 @@ class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
         Returns:
             Total count of filtered products
         """
-        query = db.query(Product)
+        result = await db.execute(
+            select(func.count())
+            .select_from(Product)
+            .where(*self._filter_conditions(**filters))
+        )
+        return result.scalar_one()
+    
+    async def get_multi_with_filters_and_count(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[float, int]] = None,
+        with_category: bool = False,
+        **filters,
+    ) -> Tuple[List[Product], int]:
+        """
+        Get a page of filtered products and the total count in one query
         
-        if is_active is not None:
-            query = query.filter(Product.is_active == is_active)
-        if category_id:
-            query = query.filter(Product.category_id == category_id)
-        if is_featured is not None:
-            query = query.filter(Product.is_featured == is_featured)
-        if min_price_usd is not None:
-            query = query.filter(Product.price_usd >= min_price_usd)
-        if max_price_usd is not None:
-            query = query.filter(Product.price_usd <= max_price_usd)
-        if in_stock is not None:
-            if in_stock:
-                query = query.filter(Product.stock > 0)
-            else:
-                query = query.filter(Product.stock == 0)
-        if search:
-            search_filter = or_(
-                Product.name.ilike(f"%{search}%"),
-                Product.description.ilike(f"%{search}%"),
+        Products are ordered by (price_usd, id). The total comes from
+        COUNT(*) OVER () on each row, so the filters are evaluated once.
+        
+        With a keyset cursor (after) the page starts right after that
+        (price_usd, id) instead of skipping rows with OFFSET, so deep pages
+        cost the same as the first one. The cursor predicate would shrink
+        the window count, so the total is counted separately in that case,
+        as it is for a page past the end.
+        
+        Args:
+            db: Database session
+            skip: Offset for pagination (ignored when after is given)
+            limit: Limit for pagination
+            after: (price_usd, id) of the last product of the previous page
+            with_category: Batch-load each product's category (one IN query)
+            **filters: Same filters as get_multi_with_filters
+        
+        Returns:
+            Tuple of (products, total count of filtered products)
+        """
+        conditions = self._filter_conditions(**filters)
+        order = (Product.price_usd, Product.id)
+        options = [selectinload(Product.category)] if with_category else []
+        
+        if after is not None:
+            result = await db.execute(
+                select(Product)
+                .where(*conditions, tuple_(*order) > tuple_(*after))
+                .order_by(*order)
+                .limit(limit)
+                .options(*options)
             )
-            query = query.filter(search_filter)
+            products = list(result.scalars().all())
+            return products, await self.count_with_filters(db, **filters)
         
-        return query.count()
+        query = (
+            select(Product, func.count().over().label("total"))
+            .where(*conditions)
+            .order_by(*order)
+            .offset(skip)
+            .limit(limit)
+            .options(*options)
+        )
+        rows = (await db.execute(query)).all()
+        
+        if rows:
+            return [row.Product for row in rows], rows[0].total
+        if skip == 0:
+            return [], 0
+        return [], await self.count_with_filters(db, **filters)
     
-    def get_featured(self, db: Session, *, limit: int = 10) -> List[Product]:
+    async def get_featured(
+        self,
+        db: AsyncSession,
+        *,
+        limit: int = 10,
+        with_category: bool = False,
+    ) -> List[Product]:
         """
         Get featured products
         
         Args:
             db: Database session
             limit: Maximum number of products
+            with_category: Batch-load each product's category (one IN query)
         
         Returns:
             List of featured products
         """
-        return db.query(Product)\
-            .filter(Product.is_featured == True)\
-            .filter(Product.is_active == True)\
-            .limit(limit)\
-            .all()
+        query = (
+            select(Product)
+            .where(Product.is_featured == True)
+            .where(Product.is_active == True)
+            .limit(limit)
+        )
+        if with_category:
+            query = query.options(selectinload(Product.category))
+        result = await db.execute(query)
+        return list(result.scalars().all())
+    
+    async def create(self, db: AsyncSession, *, obj_in: ProductCreate) -> Product:
+        """Create a product and invalidate the cached lists"""
+        db_obj = await super().create(db, obj_in=obj_in)
+        await bump_cache_version(*_PRODUCT_CACHES)
+        return db_obj
+    
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: Product,
+        obj_in: Union[ProductUpdate, Dict[str, Any]]
+    ) -> Product:
+        """Update a product and invalidate the cached lists"""
+        db_obj = await super().update(db, db_obj=db_obj, obj_in=obj_in)
+        await bump_cache_version(*_PRODUCT_CACHES)
+        return db_obj
+    
+    async def delete(self, db: AsyncSession, *, id: int) -> Product:
+        """Delete a product and invalidate the cached lists"""
+        db_obj = await super().delete(db, id=id)
+        await bump_cache_version(*_PRODUCT_CACHES)
+        return db_obj
 
 
 product = CRUDProduct(Product)
@@ -1,16 +1,53 @@
-from typing import Optional
-from sqlalchemy.orm import Session
+import hashlib
+from typing import Any, Dict, NamedTuple, Optional, Union
+from sqlalchemy import Row, bindparam, exists, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.base import CRUDBase
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash, verify_password
+from app.schemas.user import Address, UserCreate, UserUpdate
+from app.core.security import get_password_hash, password_needs_rehash, verify_password
+from app.core.cache import cache_delete, cache_get, cache_set
+
+# Unknown emails are cached briefly so repeated failed logins skip the
+# database; only the negative result is stored, never a password hash
+AUTH_RECORD_TTL_SECONDS = 30
+
+
+class AuthRecord(NamedTuple):
+    """What authenticate returns: the user's id and login flags"""
+    
+    id: int
+    is_active: bool
+    is_verified: bool
+
+
+# Lookups by email, built once; the email is bound per call
+_get_by_email_stmt = select(User).where(User.email == bindparam("email"))
+_get_auth_record_stmt = select(
+    User.id, User.hashed_password, User.is_active, User.is_verified
+).where(User.email == bindparam("email"))
+_exists_by_email_stmt = select(exists().where(User.email == bindparam("email")))
+
+
+# JSONB address columns, stored without null keys whichever way they're written
+ADDRESS_FIELDS = frozenset({"shipping_address", "billing_address"})
+
+
+def _address_data(address: Optional[Address]) -> Optional[dict]:
+    """JSONB value for an address column: only the fields that are set"""
+    return address.model_dump(exclude_none=True) if address else None
+
+
+def _auth_record_key(email: str) -> str:
+    """Cache key for an email's "no such user" entry; hashed so no address is stored"""
+    return f"user:email:{hashlib.sha1(email.encode()).hexdigest()}"
 
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
     """CRUD operations for User model"""
     
-    def get_by_email(self, db: Session, *, email: str) -> Optional[User]:
+    async def get_by_email(self, db: AsyncSession, *, email: str) -> Optional[User]:
         """
         Get user by email
         
@@ -21,9 +58,57 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         Returns:
             User object or None
         """
-        return db.query(User).filter(User.email == email).first()
+        result = await db.execute(_get_by_email_stmt, {"email": email})
+        return result.scalar_one_or_none()
     
-    def create(self, db: Session, *, obj_in: UserCreate) -> User:
+    async def exists_by_email(self, db: AsyncSession, *, email: str) -> bool:
+        """
+        Check if a user with this email exists
+        
+        Answered from the unique email index, without loading the row
+        
+        Args:
+            db: Database session
+            email: User email
+        
+        Returns:
+            True if the email is taken
+        """
+        return await db.scalar(_exists_by_email_stmt, {"email": email})
+    
+    async def get_auth_record_by_email(
+        self, db: AsyncSession, *, email: str
+    ) -> Optional[Row]:
+        """
+        Get the columns needed to authenticate a user
+        
+        Emails with no user are cached for AUTH_RECORD_TTL_SECONDS, so
+        repeated attempts with an unknown email skip the database. Found
+        users are always read from the database and never cached, so no
+        password hash ends up in Redis.
+        
+        Args:
+            db: Database session
+            email: User email
+        
+        Returns:
+            Row of id, hashed_password, is_active and is_verified, or None
+            if no user has this email
+        """
+        key = _auth_record_key(email)
+        if await cache_get(key) is None:
+            return None
+        
+        row = (await db.execute(_get_auth_record_stmt, {"email": email})).first()
+        if row is None:
+            await cache_set(key, None, AUTH_RECORD_TTL_SECONDS)
+        return row
+    
+    async def invalidate_auth_record(self, email: str) -> None:
+        """Drop the cached "no such user" result for an email"""
+        await cache_delete(_auth_record_key(email))
+    
+    async def create(self, db: AsyncSession, *, obj_in: UserCreate) -> User:
         """
         Create new user with hashed password
         
@@ -36,19 +121,60 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         """
         db_obj = User(
             email=obj_in.email,
-            hashed_password=get_password_hash(obj_in.password),
+            hashed_password=await get_password_hash(obj_in.password),
             first_name=obj_in.first_name,
             last_name=obj_in.last_name,
             phone=obj_in.phone or None,
+            shipping_address=_address_data(obj_in.shipping_address),
+            billing_address=_address_data(obj_in.billing_address),
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        # Clear a cached "no such user" for this email
+        await self.invalidate_auth_record(db_obj.email)
+        return db_obj
+    
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: User,
+        obj_in: Union[UserUpdate, Dict[str, Any]]
+    ) -> User:
+        """
+        Update user
+        
+        Addresses are stored in the same shape as on registration (no null
+        keys); an address sent as null clears the column.
+        
+        Args:
+            db: Database session
+            db_obj: User to update
+            obj_in: User update schema or dict of fields
+        
+        Returns:
+            Updated user object
+        """
+        if not isinstance(obj_in, dict):
+            update_data = obj_in.model_dump(exclude_unset=True, exclude=ADDRESS_FIELDS)
+            for field in ADDRESS_FIELDS & obj_in.model_fields_set:
+                update_data[field] = _address_data(getattr(obj_in, field))
+            obj_in = update_data
+        
+        # Imported here: app.core.dependencies imports this module
+        from app.core.dependencies import invalidate_user_cache
+        
+        db_obj = await super().update(db, db_obj=db_obj, obj_in=obj_in)
+        # Requests authenticated by a cached token reload the changed user
+        invalidate_user_cache(db_obj.id)
+        # Clear a cached "no such user" for the (possibly new) email
+        await self.invalidate_auth_record(db_obj.email)
         return db_obj
     
-    def authenticate(
-        self, db: Session, *, email: str, password: str
-    ) -> Optional[User]:
+    async def authenticate(
+        self, db: AsyncSession, *, email: str, password: str
+    ) -> Optional[AuthRecord]:
         """
         Authenticate user with email and password
         
@@ -58,14 +184,26 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             password: Plain text password
         
         Returns:
-            User object if authenticated, None otherwise
+            The user's id, is_active and is_verified if authenticated,
+            None otherwise
         """
-        user = self.get_by_email(db, email=email)
-        if not user:
+        record = await self.get_auth_record_by_email(db, email=email)
+        if record is None:
             return None
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password(password, record.hashed_password):
             return None
-        return user
+        
+        # Upgrade hashes made with older Argon2 parameters while we still
+        # have the plain password
+        if password_needs_rehash(record.hashed_password):
+            await db.execute(
+                update(User)
+                .where(User.id == record.id)
+                .values(hashed_password=await get_password_hash(password))
+            )
+            await db.commit()
+        
+        return AuthRecord(record.id, record.is_active, record.is_verified)
     
     def is_active(self, user: User) -> bool:
         """Check if user is active"""
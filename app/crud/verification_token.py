@@ -1,17 +1,24 @@
+from datetime import datetime, timezone
 from typing import Optional
-from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, select, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.security import hash_verification_token
 from app.crud.base import CRUDBase
 from app.models.verification_token import VerificationToken
 
+# Token lookup, built once; the token digest is bound per call
+_get_by_token_stmt = select(VerificationToken).where(
+    VerificationToken.token_hash == bindparam("token_hash")
+)
+
 
 class CRUDVerificationToken(CRUDBase[VerificationToken, None, None]):
     """CRUD operations for VerificationToken model"""
     
-    def create_for_user(
+    async def create_for_user(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         user_id: int, 
         hours: int = 24
@@ -25,24 +32,25 @@ class CRUDVerificationToken(CRUDBase[VerificationToken, None, None]):
             hours: Token validity in hours (default 24)
         
         Returns:
-            Created VerificationToken object
+            Created VerificationToken object, with the raw token in `token`
         """
         token_str = VerificationToken.generate_token()
         expires_at = VerificationToken.get_expiration_time(hours=hours)
         
         db_obj = VerificationToken(
-            token=token_str,
+            token_hash=hash_verification_token(token_str),
             user_id=user_id,
             expires_at=expires_at
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        db_obj.token = token_str
         return db_obj
     
-    def get_by_token(
+    async def get_by_token(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         token: str
     ) -> Optional[VerificationToken]:
@@ -56,13 +64,14 @@ class CRUDVerificationToken(CRUDBase[VerificationToken, None, None]):
         Returns:
             VerificationToken object or None
         """
-        return db.query(VerificationToken).filter(
-            VerificationToken.token == token
-        ).first()
+        result = await db.execute(
+            _get_by_token_stmt, {"token_hash": hash_verification_token(token)}
+        )
+        return result.scalar_one_or_none()
     
-    def get_by_user_id(
+    async def get_by_user_id(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         user_id: int
     ) -> Optional[VerificationToken]:
@@ -76,13 +85,17 @@ class CRUDVerificationToken(CRUDBase[VerificationToken, None, None]):
         Returns:
             Most recent VerificationToken object or None
         """
-        return db.query(VerificationToken).filter(
-            VerificationToken.user_id == user_id
-        ).order_by(VerificationToken.created_at.desc()).first()
+        result = await db.execute(
+            select(VerificationToken)
+            .where(VerificationToken.user_id == user_id)
+            .order_by(VerificationToken.created_at.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
     
-    def delete_by_token(
+    async def delete_by_token(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         token: str
     ) -> bool:
@@ -96,16 +109,18 @@ class CRUDVerificationToken(CRUDBase[VerificationToken, None, None]):
         Returns:
             True if deleted, False if not found
         """
-        db_obj = self.get_by_token(db, token=token)
-        if db_obj:
-            db.delete(db_obj)
-            db.commit()
-            return True
-        return False
+        result = await db.execute(
+            delete(VerificationToken)
+            .where(VerificationToken.token_hash == hash_verification_token(token))
+            .returning(VerificationToken.id)
+        )
+        deleted = result.first() is not None
+        await db.commit()
+        return deleted
     
-    def delete_by_user_id(
+    async def delete_by_user_id(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         user_id: int
     ) -> int:
@@ -119,13 +134,13 @@ class CRUDVerificationToken(CRUDBase[VerificationToken, None, None]):
         Returns:
             Number of tokens deleted
         """
-        count = db.query(VerificationToken).filter(
-            VerificationToken.user_id == user_id
-        ).delete()
-        db.commit()
-        return count
+        result = await db.execute(
+            delete(VerificationToken).where(VerificationToken.user_id == user_id)
+        )
+        await db.commit()
+        return result.rowcount
     
-    def cleanup_expired(self, db: Session) -> int:
+    async def cleanup_expired(self, db: AsyncSession) -> int:
         """
         Delete all expired verification tokens
         
@@ -135,17 +150,20 @@ class CRUDVerificationToken(CRUDBase[VerificationToken, None, None]):
         Returns:
             Number of tokens deleted
         """
-        count = db.query(VerificationToken).filter(
-            VerificationToken.expires_at < datetime.utcnow()
-        ).delete()
-        db.commit()
-        return count
+        result = await db.execute(
+            delete(VerificationToken).where(
+                VerificationToken.expires_at < func.now()
+            )
+        )
+        await db.commit()
+        return result.rowcount
     
-    def is_valid(
+    async def is_valid(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
-        token: str
+        token: str,
+        now: Optional[datetime] = None
     ) -> tuple[bool, Optional[str]]:
         """
         Check if token is valid (exists and not expired)
@@ -153,16 +171,18 @@ class CRUDVerificationToken(CRUDBase[VerificationToken, None, None]):
         Args:
             db: Database session
             token: Token string
+            now: Current time (timezone-aware), e.g. from current_utc_now;
+                defaults to the current time
         
         Returns:
             Tuple of (is_valid, error_message)
         """
-        db_obj = self.get_by_token(db, token=token)
+        db_obj = await self.get_by_token(db, token=token)
         
         if not db_obj:
             return False, "Invalid verification token"
         
-        if db_obj.is_expired:
+        if db_obj.is_expired_at(now or datetime.now(timezone.utc)):
             return False, "Verification token has expired"
         
         return True, None
@@ -1,11 +1,33 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+import orjson
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from app.core.config import settings
+from app.core.email import start_email_workers, stop_email_workers
+from app.core.logging_config import setup_logging, shutdown_logging
+from app.core.security import shutdown_hash_executor
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop background workers with the application"""
+    setup_logging()
+    start_email_workers()
+    yield
+    await stop_email_workers()
+    shutdown_hash_executor()
+    shutdown_logging()
+
 
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     description="E-commerce API built with FastAPI",
+    lifespan=lifespan,
+    # orjson encodes large list responses several times faster than json
+    default_response_class=ORJSONResponse,
 )
 
 # CORS Configuration
@@ -17,19 +39,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger responses (product listings); small ones aren't worth it
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# Health payloads never change, so they are encoded once; returning a plain
+# Response skips serialization on every (frequent) probe
+_ROOT_PAYLOAD = orjson.dumps({
+    "message": "E-commerce API is running",
+    "version": settings.APP_VERSION,
+    "status": "healthy"
+})
+_HEALTH_PAYLOAD = orjson.dumps({"status": "ok"})
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
-    return {
-        "message": "E-commerce API is running",
-        "version": settings.APP_VERSION,
-        "status": "healthy"
-    }
+    return Response(_ROOT_PAYLOAD, media_type="application/json")
 
 @app.get("/health")
 async def health():
     """Health check for monitoring"""
-    return {"status": "ok"}
+    return Response(_HEALTH_PAYLOAD, media_type="application/json")
 
 
 # Import routers
@@ -3,5 +3,6 @@ from app.models.user import User
 from app.models.category import Category
 from app.models.product import Product
 from app.models.order import Order, OrderItem
+from app.models.verification_token import VerificationToken
 
-__all__ = ["Base", "User", "Category", "Product", "Order", "OrderItem"]
+__all__ = ["Base", "User", "Category", "Product", "Order", "OrderItem", "VerificationToken"]
@@ -1,20 +1,29 @@
-from datetime import datetime
-from sqlalchemy import Column, Integer, DateTime
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import Column, Integer, DateTime, func
+from sqlalchemy.orm import DeclarativeBase
 
-Base = declarative_base()
+
+class Base(DeclarativeBase):
+    """Declarative base for all models"""
+
+
+# Current time in UTC as computed by Postgres; timestamp columns are naive
+# and hold UTC, so this doesn't depend on the session time zone
+utc_now = func.timezone("utc", func.now())
 
 
 class TimestampMixin:
     """Mixin that adds timestamp fields to models"""
     
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=utc_now, nullable=False)
+    updated_at = Column(DateTime, server_default=utc_now, onupdate=utc_now, nullable=False)
 
 
 class BaseModel(Base, TimestampMixin):
     """Base model with id and timestamps"""
     
     __abstract__ = True
+    # Fetch server-generated timestamps with RETURNING on INSERT/UPDATE
+    # instead of expiring them, so they never need a lazy load
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(Integer, primary_key=True, index=True)
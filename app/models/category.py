@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Boolean
+from sqlalchemy import Column, String, Text, Boolean, Integer
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 
@@ -13,6 +13,10 @@ class Category(BaseModel):
     description = Column(Text, nullable=True)
     is_active = Column(Boolean, default=True, nullable=False)
     
+    # Number of active products, maintained by a trigger on products
+    # (see migration e7a9c1d3f5b6); read-only from the application
+    product_count = Column(Integer, server_default="0", nullable=False)
+    
     # Parent category for nested categories (optional)
     # parent_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
     
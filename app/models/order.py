@@ -21,7 +21,7 @@ class Order(BaseModel):
     __tablename__ = "orders"
     
     # User
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     
     # Order details
     order_number = Column(String(50), unique=True, index=True, nullable=False)
@@ -48,8 +48,10 @@ class Order(BaseModel):
     notes = Column(Text, nullable=True)
     
     # Relationships
-    user = relationship("User", back_populates="orders")
-    items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
+    # selectin loads the user and items of every fetched order in one extra
+    # query each (WHERE id IN (...)) instead of one query per order
+    user = relationship("User", back_populates="orders", lazy="selectin")
+    items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan", lazy="selectin")
     
     def __repr__(self):
         return f"<Order {self.order_number}>"
@@ -61,7 +63,7 @@ class OrderItem(BaseModel):
     __tablename__ = "order_items"
     
     # Order
-    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False)
+    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False, index=True)
     
     # Product
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
@@ -75,7 +77,9 @@ class OrderItem(BaseModel):
     
     # Relationships
     order = relationship("Order", back_populates="items")
-    product = relationship("Product", back_populates="order_items")
+    # Responses use the product snapshot columns above, so loading the
+    # product is opt-in (selectinload/joinedload) rather than lazy
+    product = relationship("Product", back_populates="order_items", lazy="raise_on_sql")
     
     def __repr__(self):
         return f"<OrderItem {self.product_name} x{self.quantity}>"
@@ -1,12 +1,60 @@
-from sqlalchemy import Column, String, Text, Integer, Float, Boolean, ForeignKey, JSON
+from sqlalchemy import Column, String, Text, Integer, Float, Boolean, ForeignKey, Computed, Index, text
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 
+# Supported currencies: code -> price column attribute. Prices stay in
+# plain float columns (not one JSONB map) since listings sort, filter and
+# index on price_usd; a new currency is a column plus an entry here.
+PRICE_COLUMNS = {"USD": "price_usd", "PLN": "price_pln", "EUR": "price_eur"}
+
 
 class Product(BaseModel):
     """Product model with multi-currency support"""
     
     __tablename__ = "products"
+    __table_args__ = (
+        Index("ix_products_search_vec", "search_vec", postgresql_using="gin"),
+        # Trigram indexes (pg_trgm) so substring ILIKE search avoids a seq scan
+        Index(
+            "ix_products_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_products_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+        # Partial indexes for the storefront listing filters, which almost
+        # always include is_active = true
+        Index(
+            "ix_products_active_category_price",
+            "category_id",
+            "price_usd",
+            postgresql_where=text("is_active"),
+        ),
+        # Default listing order and keyset cursor, (price_usd, id), when no
+        # category is selected
+        Index(
+            "ix_products_active_price_id",
+            "price_usd",
+            "id",
+            postgresql_where=text("is_active"),
+        ),
+        Index(
+            "ix_products_featured",
+            "id",
+            postgresql_where=text("is_featured AND is_active"),
+        ),
+        Index(
+            "ix_products_in_stock",
+            "id",
+            postgresql_where=text("stock > 0 AND is_active"),
+        ),
+    )
     
     # Basic info
     name = Column(String(200), nullable=False, index=True)
@@ -14,6 +62,15 @@ class Product(BaseModel):
     description = Column(Text, nullable=True)
     sku = Column(String(100), unique=True, index=True, nullable=True)
     
+    # Full-text search document, maintained by Postgres (GIN indexed)
+    search_vec = Column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('english', coalesce(name, '') || ' ' || coalesce(description, ''))",
+            persisted=True,
+        ),
+    )
+    
     # Pricing (multi-currency)
     price_usd = Column(Float, nullable=False)
     price_pln = Column(Float, nullable=False)
@@ -24,14 +81,16 @@ class Product(BaseModel):
     is_active = Column(Boolean, default=True, nullable=False)
     is_featured = Column(Boolean, default=False, nullable=False)
     
-    # Images (JSON array of image URLs)
-    images = Column(JSON, default=list, nullable=False)
+    # Images (native array of image URLs, decoded by the driver without JSON parsing)
+    images = Column(ARRAY(String), default=list, nullable=False)
     
     # Category
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
     
     # Relationships
-    category = relationship("Category", back_populates="products")
+    # Never lazy-loaded: an implicit load per product is an N+1 (and fails on
+    # AsyncSession anyway), so queries must ask for it with selectinload
+    category = relationship("Category", back_populates="products", lazy="raise_on_sql")
     order_items = relationship("OrderItem", back_populates="product")
     
     def __repr__(self):
@@ -44,9 +103,6 @@ class Product(BaseModel):
     
     def get_price(self, currency: str = "USD") -> float:
         """Get price for specific currency"""
-        currency_map = {
-            "USD": self.price_usd,
-            "PLN": self.price_pln,
-            "EUR": self.price_eur,
-        }
-        return currency_map.get(currency.upper(), self.price_usd)
+        # Codes are validated as uppercase upstream; upper() only on a miss
+        attr = PRICE_COLUMNS.get(currency) or PRICE_COLUMNS.get(currency.upper(), "price_usd")
+        return getattr(self, attr)
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, String, Boolean, Enum as SQLEnum
+from sqlalchemy import Column, String, Boolean, Computed, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 import enum
 from app.models.base import BaseModel
@@ -6,8 +7,8 @@ from app.models.base import BaseModel
 
 class UserRole(str, enum.Enum):
     """User roles"""
-    CUSTOMER = "CUSTOMER"
-    ADMIN = "ADMIN"
+    CUSTOMER = "customer"
+    ADMIN = "admin"
 
 
 class User(BaseModel):
@@ -25,25 +26,29 @@ class User(BaseModel):
     first_name = Column(String(100), nullable=False)
     last_name = Column(String(100), nullable=False)
     phone = Column(String(20), nullable=True)
-    
-    # Shipping Address (optional)
-    shipping_street = Column(String(255), nullable=True)
-    shipping_city = Column(String(100), nullable=True)
-    shipping_postal_code = Column(String(20), nullable=True)
-    shipping_country = Column(String(100), nullable=True)
-    shipping_state = Column(String(100), nullable=True)
-    
-    # Company/Invoice Data (optional)
-    company_name = Column(String(255), nullable=True)
-    company_tax_id = Column(String(50), nullable=True)
-    company_address_street = Column(String(255), nullable=True)
-    company_address_city = Column(String(100), nullable=True)
-    company_address_postal_code = Column(String(20), nullable=True)
-    company_address_country = Column(String(100), nullable=True)
-    company_address_state = Column(String(100), nullable=True)
+    # Display name, generated by Postgres on write (falls back to the email)
+    full_name = Column(
+        String(255),
+        Computed(
+            "CASE WHEN first_name <> '' AND last_name <> '' "
+            "THEN first_name || ' ' || last_name ELSE email END",
+            persisted=True,
+        ),
+    )
+    
+    # Shipping address (optional, see schemas.user.Address)
+    shipping_address = Column(JSONB, nullable=True)
+    
+    # Company/invoice data (optional, see schemas.user.Company)
+    billing_address = Column(JSONB, nullable=True)
     
     # Role
-    role = Column(SQLEnum(UserRole), default=UserRole.CUSTOMER, nullable=False)
+    # Stored by value, so the database labels match what the API returns
+    role = Column(
+        SQLEnum(UserRole, values_callable=lambda roles: [role.value for role in roles]),
+        default=UserRole.CUSTOMER,
+        nullable=False,
+    )
     
     # Relationships
     orders = relationship("Order", back_populates="user", cascade="all, delete-orphan")
@@ -51,10 +56,3 @@ class User(BaseModel):
     
     def __repr__(self):
         return f"<User {self.email}>"
-    
-    @property
-    def full_name(self):
-        """Get user's full name"""
-        if self.first_name and self.last_name:
-            return f"{self.first_name} {self.last_name}"
-        return self.email
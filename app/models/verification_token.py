@@ -1,7 +1,8 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, LargeBinary, Index
 from sqlalchemy.orm import relationship
-from datetime import datetime, timedelta
-import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+import secrets
 
 from app.models.base import BaseModel
 
@@ -10,29 +11,42 @@ class VerificationToken(BaseModel):
     """Email verification token model"""
     
     __tablename__ = "verification_tokens"
+    # Serves get_by_user_id (latest token first), delete_by_user_id and the
+    # ON DELETE CASCADE from users
+    __table_args__ = (
+        Index("ix_verification_tokens_user_id_created_at", "user_id", "created_at"),
+    )
     
     # Token fields
-    token = Column(String(255), unique=True, index=True, nullable=False)
+    # Only the HMAC digest of the token is stored (see hash_verification_token)
+    token_hash = Column(LargeBinary(32), unique=True, index=True, nullable=False)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    expires_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime(timezone=True), index=True, nullable=False)  # indexed for cleanup_expired
     
     # Relationships
     user = relationship("User", back_populates="verification_tokens", passive_deletes=True)
     
+    # Raw token, only set on a freshly created instance so it can be emailed
+    token = None
+    
     def __repr__(self):
-        return f"<VerificationToken {self.token[:8]}... for user_id={self.user_id}>"
+        return f"<VerificationToken {self.token_hash.hex()[:8]}... for user_id={self.user_id}>"
     
     @property
     def is_expired(self) -> bool:
         """Check if token has expired"""
-        return datetime.utcnow() > self.expires_at
+        return self.is_expired_at(datetime.now(timezone.utc))
+    
+    def is_expired_at(self, now: datetime) -> bool:
+        """Check if token has expired at the given (timezone-aware) time"""
+        return now > self.expires_at
     
     @staticmethod
     def generate_token() -> str:
-        """Generate a unique verification token"""
-        return str(uuid.uuid4())
+        """Generate a unique verification token (256 bits, URL-safe)"""
+        return secrets.token_urlsafe(32)
     
     @staticmethod
-    def get_expiration_time(hours: int = 24) -> datetime:
+    def get_expiration_time(hours: int = 24, now: Optional[datetime] = None) -> datetime:
         """Get expiration datetime (default 24 hours from now)"""
-        return datetime.utcnow() + timedelta(hours=hours)
+        return (now or datetime.now(timezone.utc)) + timedelta(hours=hours)
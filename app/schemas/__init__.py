@@ -1,5 +1,7 @@
 from app.schemas.base import BaseSchema, TimestampSchema
 from app.schemas.user import (
+    Address,
+    Company,
     UserBase,
     UserCreate,
     UserUpdate,
@@ -12,7 +14,6 @@ from app.schemas.category import (
     CategoryCreate,
     CategoryUpdate,
     CategoryResponse,
-    CategoryWithProductCount,
 )
 from app.schemas.product import (
     ProductBase,
@@ -47,6 +48,8 @@ __all__ = [
     "BaseSchema",
     "TimestampSchema",
     # User
+    "Address",
+    "Company",
     "UserBase",
     "UserCreate",
     "UserUpdate",
@@ -58,7 +61,6 @@ __all__ = [
     "CategoryCreate",
     "CategoryUpdate",
     "CategoryResponse",
-    "CategoryWithProductCount",
     # Product
     "ProductBase",
     "ProductCreate",
@@ -1,6 +1,6 @@
-from pydantic import Field
 from typing import Optional
 from app.schemas.base import BaseSchema
+from app.schemas.user import EmailLookup, Password
 
 
 class Token(BaseSchema):
@@ -22,20 +22,20 @@ class PasswordChange(BaseSchema):
     """Schema for password change"""
     
     old_password: str
-    new_password: str = Field(..., min_length=8, max_length=100)
+    new_password: Password
 
 
 class PasswordReset(BaseSchema):
     """Schema for password reset request"""
     
-    email: str
+    email: EmailLookup
 
 
 class PasswordResetConfirm(BaseSchema):
     """Schema for password reset confirmation"""
     
     token: str
-    new_password: str = Field(..., min_length=8, max_length=100)
+    new_password: Password
 
 
 class EmailVerification(BaseSchema):
@@ -47,4 +47,4 @@ class EmailVerification(BaseSchema):
 class EmailResend(BaseSchema):
     """Schema for resending verification email"""
     
-    email: str
+    email: EmailLookup
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
+from typing import Any
 
 
 class BaseSchema(BaseModel):
@@ -8,8 +9,29 @@ class BaseSchema(BaseModel):
     model_config = ConfigDict(
         from_attributes=True,  # Allows creating from ORM models
         populate_by_name=True,
-        use_enum_values=True,
+        frozen=True,  # Schemas are read-only once validated
     )
+    
+    @classmethod
+    def construct_from_orm(cls, obj: Any, **values: Any):
+        """
+        Build the schema from an ORM object without validation
+        
+        For hot read paths where the database already guarantees the data.
+        Nested schemas are not converted, so only use on flat schemas.
+        
+        Args:
+            obj: ORM object to read field values from
+            **values: Field values not available on obj (e.g. aggregates)
+        
+        Returns:
+            Schema instance
+        """
+        data = {
+            name: getattr(obj, name) for name in cls.model_fields if name not in values
+        }
+        data.update(values)
+        return cls.model_construct(**data)
 
 
 class TimestampSchema(BaseSchema):
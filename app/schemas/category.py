@@ -1,5 +1,5 @@
-from pydantic import Field
-from typing import Optional
+from pydantic import Field, TypeAdapter
+from typing import List, Optional
 from app.schemas.base import BaseSchema, TimestampSchema
 
 
@@ -28,10 +28,9 @@ class CategoryUpdate(BaseSchema):
 
 class CategoryResponse(CategoryBase, TimestampSchema):
     """Schema for category response"""
-    pass
-
-
-class CategoryWithProductCount(CategoryResponse):
-    """Category response with product count"""
     
     product_count: int = 0
+
+
+# Serializes the category list straight to JSON bytes for the cache
+CATEGORY_LIST_ADAPTER = TypeAdapter(List[CategoryResponse])
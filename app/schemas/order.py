@@ -3,6 +3,7 @@ from typing import Optional, List
 from app.schemas.base import BaseSchema, TimestampSchema
 from app.schemas.user import UserResponse
 from app.models.order import OrderStatus
+from app.models.product import PRICE_COLUMNS
 
 
 class OrderItemBase(BaseSchema):
@@ -44,7 +45,7 @@ class OrderCreate(OrderBase):
     """Schema for creating an order"""
     
     items: List[OrderItemCreate] = Field(..., min_length=1)
-    currency: str = Field(default="USD", pattern="^(USD|PLN|EUR)$")
+    currency: str = Field(default="USD", pattern=f"^({'|'.join(PRICE_COLUMNS)})$")
 
 
 class OrderUpdate(BaseSchema):
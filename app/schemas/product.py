@@ -1,4 +1,4 @@
-from pydantic import Field, field_validator
+from pydantic import Field, TypeAdapter, computed_field, field_validator
 from typing import Optional, List
 from app.schemas.base import BaseSchema, TimestampSchema
 from app.schemas.category import CategoryResponse
@@ -61,8 +61,7 @@ class ProductUpdate(BaseSchema):
 class ProductResponse(ProductBase, TimestampSchema):
     """Schema for product response"""
     
-    in_stock: bool
-    
+    @computed_field
     @property
     def in_stock(self) -> bool:
         """Check if product is in stock"""
@@ -75,6 +74,11 @@ class ProductWithCategory(ProductResponse):
     category: Optional[CategoryResponse] = None
 
 
+# Serializes a list of ProductResponse directly, without going through a
+# wrapper model; built once since adapters compile their schema up front
+PRODUCT_LIST_ADAPTER = TypeAdapter(List[ProductResponse])
+
+
 class ProductListResponse(BaseSchema):
     """Schema for paginated product list"""
     
@@ -83,3 +87,8 @@ class ProductListResponse(BaseSchema):
     page: int
     page_size: int
     pages: int
+    
+    # Keyset cursor for the next page (pass back as after_price/after_id);
+    # None when this page is the last one
+    next_after_price: Optional[float] = None
+    next_after_id: Optional[int] = None
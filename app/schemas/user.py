@@ -1,13 +1,60 @@
-from pydantic import EmailStr, Field, field_validator
-from typing import Optional
+from pydantic import AfterValidator, EmailStr, Field, StringConstraints
+from typing import Annotated, Optional
 from app.schemas.base import BaseSchema, TimestampSchema
 from app.models.user import UserRole
 
+def _check_password_strength(v: str) -> str:
+    """Require at least one digit and one uppercase letter"""
+    if not any(char.isdigit() for char in v):
+        raise ValueError("Password must contain at least one digit")
+    if not any(char.isupper() for char in v):
+        raise ValueError("Password must contain at least one uppercase letter")
+    return v
+
+
+# Password strength: 8-100 characters (checked by pydantic-core) with at
+# least one digit and one uppercase letter, reported with readable messages
+Password = Annotated[
+    str,
+    StringConstraints(min_length=8, max_length=100),
+    AfterValidator(_check_password_strength),
+]
+
+# Email used as a lookup key or read back from the database: a cheap shape
+# check in pydantic-core. Full validation (EmailStr, via email-validator)
+# is only done where an email address enters the system, i.e. registration
+# (PUT /me updates the profile and postal addresses but not the email).
+EmailLookup = Annotated[
+    str,
+    StringConstraints(max_length=255, pattern=r"^[^@\s]+@[^@\s]+\.[^@\s]+$"),
+]
+
+
+class Address(BaseSchema):
+    """
+    Postal address (stored as JSONB on the user)
+    
+    Written on registration and by PUT /me, both without null keys.
+    """
+    
+    street: Optional[str] = Field(None, max_length=255)
+    city: Optional[str] = Field(None, max_length=100)
+    postal_code: Optional[str] = Field(None, max_length=20)
+    country: Optional[str] = Field(None, max_length=100)
+    state: Optional[str] = Field(None, max_length=100)
+
+
+class Company(Address):
+    """Company/invoice data with the company address"""
+    
+    name: Optional[str] = Field(None, max_length=255)
+    tax_id: Optional[str] = Field(None, max_length=50)
+
 
 class UserBase(BaseSchema):
     """Base user schema with common fields"""
     
-    email: EmailStr
+    email: EmailLookup
     first_name: str
     last_name: str
     phone: Optional[str] = None
@@ -16,33 +63,12 @@ class UserBase(BaseSchema):
 class UserCreate(UserBase):
     """Schema for user registration"""
     
-    password: str = Field(..., min_length=8, max_length=100)
-    
-    # Optional shipping address
-    shipping_street: Optional[str] = None
-    shipping_city: Optional[str] = None
-    shipping_postal_code: Optional[str] = None
-    shipping_country: Optional[str] = None
-    shipping_state: Optional[str] = None
-    
-    # Optional company/invoice data
-    company_name: Optional[str] = None
-    company_tax_id: Optional[str] = None
-    company_address_street: Optional[str] = None
-    company_address_city: Optional[str] = None
-    company_address_postal_code: Optional[str] = None
-    company_address_country: Optional[str] = None
-    company_address_state: Optional[str] = None
+    email: EmailStr
+    password: Password
     
-    @field_validator("password")
-    @classmethod
-    def validate_password(cls, v: str) -> str:
-        """Validate password strength"""
-        if not any(char.isdigit() for char in v):
-            raise ValueError("Password must contain at least one digit")
-        if not any(char.isupper() for char in v):
-            raise ValueError("Password must contain at least one uppercase letter")
-        return v
+    # Optional shipping address and company/invoice data
+    shipping_address: Optional[Address] = None
+    billing_address: Optional[Company] = None
 
 
 class UserUpdate(BaseSchema):
@@ -52,21 +78,9 @@ class UserUpdate(BaseSchema):
     last_name: Optional[str] = None
     phone: Optional[str] = None
     
-    # Optional shipping address
-    shipping_street: Optional[str] = None
-    shipping_city: Optional[str] = None
-    shipping_postal_code: Optional[str] = None
-    shipping_country: Optional[str] = None
-    shipping_state: Optional[str] = None
-    
-    # Optional company/invoice data
-    company_name: Optional[str] = None
-    company_tax_id: Optional[str] = None
-    company_address_street: Optional[str] = None
-    company_address_city: Optional[str] = None
-    company_address_postal_code: Optional[str] = None
-    company_address_country: Optional[str] = None
-    company_address_state: Optional[str] = None
+    # Optional shipping address and company/invoice data
+    shipping_address: Optional[Address] = None
+    billing_address: Optional[Company] = None
 
 
 class UserResponse(UserBase, TimestampSchema):
@@ -76,21 +90,9 @@ class UserResponse(UserBase, TimestampSchema):
     is_verified: bool
     role: UserRole
     
-    # Optional shipping address
-    shipping_street: Optional[str] = None
-    shipping_city: Optional[str] = None
-    shipping_postal_code: Optional[str] = None
-    shipping_country: Optional[str] = None
-    shipping_state: Optional[str] = None
-    
-    # Optional company/invoice data
-    company_name: Optional[str] = None
-    company_tax_id: Optional[str] = None
-    company_address_street: Optional[str] = None
-    company_address_city: Optional[str] = None
-    company_address_postal_code: Optional[str] = None
-    company_address_country: Optional[str] = None
-    company_address_state: Optional[str] = None
+    # Optional shipping address and company/invoice data
+    shipping_address: Optional[Address] = None
+    billing_address: Optional[Company] = None
 
 
 class UserInDB(UserResponse):
@@ -102,5 +104,5 @@ class UserInDB(UserResponse):
 class UserLogin(BaseSchema):
     """Schema for user login"""
     
-    email: EmailStr
+    email: EmailLookup
     password: str
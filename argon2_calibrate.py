@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Pick Argon2id parameters for this machine
+
+Benchmarks Argon2id hashing and prints the ARGON2_* settings that reach the
+target hashing time. Memory is raised first (doubling from the OWASP
+baseline of 19 MiB up to --max-memory-mib), then iterations. Run it on the
+deployment hardware and copy the output into .env.
+
+Usage:
+    python argon2_calibrate.py --target-ms 250 --max-memory-mib 256
+"""
+
+import argparse
+import time
+
+from argon2 import PasswordHasher, Type
+
+# OWASP minimum for Argon2id (m=19 MiB, t=2, p=1); never go below it
+MIN_MEMORY_COST = 19456
+MIN_TIME_COST = 2
+MAX_TIME_COST = 10
+
+
+def measure_ms(memory_cost: int, time_cost: int, parallelism: int, rounds: int = 3) -> float:
+    """Median time in milliseconds to hash a password with these parameters"""
+    hasher = PasswordHasher(
+        time_cost=time_cost,
+        memory_cost=memory_cost,
+        parallelism=parallelism,
+        type=Type.ID,
+    )
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        hasher.hash("calibration-password")
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[len(timings) // 2]
+
+
+def calibrate(target_ms: float, max_memory_kib: int, parallelism: int):
+    """Return (memory_cost, time_cost, elapsed_ms) closest to target_ms"""
+    memory_cost, time_cost = MIN_MEMORY_COST, MIN_TIME_COST
+    elapsed = measure_ms(memory_cost, time_cost, parallelism)
+    print(f"m={memory_cost} KiB t={time_cost}: {elapsed:.0f} ms")
+    
+    # Spend memory first; it is what makes GPU/ASIC attacks expensive
+    while elapsed < target_ms and memory_cost * 2 <= max_memory_kib:
+        memory_cost *= 2
+        elapsed = measure_ms(memory_cost, time_cost, parallelism)
+        print(f"m={memory_cost} KiB t={time_cost}: {elapsed:.0f} ms")
+    
+    # Then iterations, once the memory budget is used up
+    while elapsed < target_ms and time_cost < MAX_TIME_COST:
+        time_cost += 1
+        elapsed = measure_ms(memory_cost, time_cost, parallelism)
+        print(f"m={memory_cost} KiB t={time_cost}: {elapsed:.0f} ms")
+    
+    return memory_cost, time_cost, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate Argon2id parameters")
+    parser.add_argument("--target-ms", type=float, default=250, help="Target hashing time per password")
+    parser.add_argument("--max-memory-mib", type=int, default=256, help="Memory budget per hash")
+    parser.add_argument("--parallelism", type=int, default=1, help="Argon2 lanes (threads) per hash")
+    args = parser.parse_args()
+    
+    memory_cost, time_cost, elapsed = calibrate(
+        args.target_ms, args.max_memory_mib * 1024, args.parallelism
+    )
+    
+    print(f"\nChosen parameters ({elapsed:.0f} ms per hash), add to .env:")
+    print(f"ARGON2_MEMORY_COST={memory_cost}")
+    print(f"ARGON2_TIME_COST={time_cost}")
+    print(f"ARGON2_PARALLELISM={args.parallelism}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,7 @@
 
 import os
 import sys
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, select
 from dotenv import load_dotenv
 
 # Add the app directory to the path
@@ -21,22 +20,36 @@ def list_users():
         print("ERROR: DATABASE_URL not found in environment variables")
         return
     
+    engine = create_engine(database_url)
     try:
-        # Create database connection
-        engine = create_engine(database_url)
-        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-        db = SessionLocal()
-        
-        # Query all users
-        users = db.query(User).all()
-        
-        if not users:
-            print("No users found in the database.")
-        else:
-            print(f"Found {len(users)} registered users:")
-            print("-" * 80)
+        # Query only the printed columns as plain rows (no ORM objects),
+        # streamed from a server-side cursor 500 rows at a time so memory
+        # stays flat however many users there are
+        with engine.connect() as conn:
+            users = conn.execute(
+                select(
+                    User.id,
+                    User.email,
+                    User.first_name,
+                    User.last_name,
+                    User.phone,
+                    User.role,
+                    User.is_active,
+                    User.is_verified,
+                    User.created_at,
+                    User.shipping_address,
+                    User.billing_address,
+                )
+                .order_by(User.id)
+                .execution_options(yield_per=500)
+            )
             
+            count = 0
             for user in users:
+                if count == 0:
+                    print("-" * 80)
+                count += 1
+                
                 print(f"ID: {user.id}")
                 print(f"Email: {user.email}")
                 print(f"Name: {user.first_name} {user.last_name}")
@@ -46,19 +59,26 @@ def list_users():
                 print(f"Verified: {user.is_verified}")
                 print(f"Created: {user.created_at}")
                 
-                if user.shipping_street:
-                    print(f"Shipping Address: {user.shipping_street}, {user.shipping_city}, {user.shipping_postal_code}")
+                shipping = user.shipping_address or {}
+                if shipping.get("street"):
+                    print(f"Shipping Address: {shipping['street']}, {shipping.get('city')}, {shipping.get('postal_code')}")
                 
-                if user.company_name:
-                    print(f"Company: {user.company_name} (Tax ID: {user.company_tax_id})")
+                company = user.billing_address or {}
+                if company.get("name"):
+                    print(f"Company: {company['name']} (Tax ID: {company.get('tax_id')})")
                 
                 print("-" * 80)
+        
+        # Rows are printed as they arrive, so the total comes last
+        if count == 0:
+            print("No users found in the database.")
+        else:
+            print(f"Found {count} registered users.")
                 
     except Exception as e:
         print(f"ERROR: Failed to connect to database or query users: {e}")
     finally:
-        if 'db' in locals():
-            db.close()
+        engine.dispose()
 
 if __name__ == "__main__":
     list_users()
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+Shared pytest configuration and fixtures
+"""
+import os
+
+# Cheap Argon2 parameters for the tests (same hash format and code path,
+# far less work per hash); must be set before app settings are loaded
+os.environ.setdefault("ARGON2_MEMORY_COST", "1024")
+os.environ.setdefault("ARGON2_TIME_COST", "1")
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from app.core.database import SessionLocal, engine
+from app.core.dependencies import get_db
+from app.main import app
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    """Run async tests on asyncio (the app uses asyncpg)"""
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+def client():
+    """
+    HTTP client for the app, shared by the whole run
+    
+    Not entered as a context manager, so the lifespan (email workers,
+    logging setup) is not started for the tests.
+    """
+    return TestClient(app)
+
+
+@pytest.fixture(scope="session")
+async def connection():
+    """
+    Database connection shared by the whole run
+    
+    Being a session-scoped async fixture, it also keeps one event loop for
+    all async tests, which the pooled asyncpg connections are bound to.
+    """
+    async with engine.connect() as conn:
+        yield conn
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db(connection):
+    """
+    Database session whose writes are rolled back after the test
+    
+    With join_transaction_mode="create_savepoint" the commits made by the
+    CRUD layer only release savepoints inside the test's transaction, so
+    nothing is ever committed and no cleanup is needed.
+    """
+    trans = await connection.begin()
+    async with SessionLocal(
+        bind=connection, join_transaction_mode="create_savepoint"
+    ) as session:
+        yield session
+    await trans.rollback()
+
+
+@pytest.fixture
+async def api(db):
+    """
+    Async HTTP client for the app, with requests served from the test's session
+    
+    Runs on the test's event loop, so routes can use the rolled-back db
+    session (the TestClient runs the app on a loop of its own).
+    """
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            yield client
+    finally:
+        app.dependency_overrides.pop(get_db, None)
@@ -1,287 +1,141 @@
 """
-Simple test script to verify CRUD operations work correctly
-Run: python test_crud.py
+CRUD operation tests against the database
+Run: pytest tests/legacy/test_crud.py
 """
-from sqlalchemy.orm import Session
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-from app.core.database import SessionLocal, engine
-from app.models import Base, User, Product, Category
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.models import Category
 from app.crud import user, product, category
 from app.schemas.user import UserCreate
 from app.schemas.product import ProductCreate
 from app.schemas.category import CategoryCreate
-from app.core.security import verify_password
 
+pytestmark = pytest.mark.anyio
 
-def test_database_connection():
+
+async def test_database_connection(db: AsyncSession):
     """Test 1: Database connection"""
-    print("\n🧪 Test 1: Database connection")
-    try:
-        db = SessionLocal()
-        # Simple query to test connection
-        db.execute(text("SELECT 1"))
-        db.close()
-        print("✅ Database connection successful")
-        return True
-    except Exception as e:
-        print(f"❌ Database connection failed: {e}")
-        return False
+    result = await db.execute(text("SELECT 1"))
+    assert result.scalar_one() == 1
 
 
-def test_user_crud(db: Session):
+async def test_user_crud(db: AsyncSession):
     """Test 2: User CRUD operations"""
-    print("\n🧪 Test 2: User CRUD")
+    # Create user
+    user_data = UserCreate(
+        email="test@example.com",
+        password="Test1234",
+        first_name="Test",
+        last_name="User"
+    )
+    new_user = await user.create(db, obj_in=user_data)
+    
+    # Test password hashing
+    assert new_user.hashed_password != "Test1234", "Password not hashed!"
+    
+    # Test get by email
+    found_user = await user.get_by_email(db, email=user_data.email)
+    assert found_user is not None, "User not found by email"
+    assert found_user.id == new_user.id, "Wrong user returned"
+    
+    # Test authentication
+    auth_user = await user.authenticate(db, email=user_data.email, password="Test1234")
+    assert auth_user is not None, "Authentication failed"
+    assert auth_user.id == new_user.id, "Wrong user authenticated"
     
-    try:
-        # Create user
-        user_data = UserCreate(
-            email="test@example.com",
-            password="Test1234",
-            first_name="Test",
-            last_name="User"
-        )
-        
-        # Check if user exists and delete
-        existing = user.get_by_email(db, email=user_data.email)
-        if existing:
-            user.delete(db, id=existing.id)
-            print("   Cleaned up existing test user")
-        
-        # Create new user
-        new_user = user.create(db, obj_in=user_data)
-        print(f"✅ User created: {new_user.email} (ID: {new_user.id})")
-        
-        # Test password hashing
-        assert new_user.hashed_password != "Test1234", "Password not hashed!"
-        print("✅ Password hashed correctly")
-        
-        # Test get by email
-        found_user = user.get_by_email(db, email=user_data.email)
-        assert found_user is not None, "User not found by email"
-        assert found_user.id == new_user.id, "Wrong user returned"
-        print("✅ Get by email works")
-        
-        # Test authentication
-        auth_user = user.authenticate(db, email=user_data.email, password="Test1234")
-        assert auth_user is not None, "Authentication failed"
-        assert auth_user.id == new_user.id, "Wrong user authenticated"
-        print("✅ Authentication works")
-        
-        # Test wrong password
-        wrong_auth = user.authenticate(db, email=user_data.email, password="WrongPass")
-        assert wrong_auth is None, "Authentication should fail with wrong password"
-        print("✅ Wrong password rejected")
-        
-        # Cleanup
-        user.delete(db, id=new_user.id)
-        print("✅ User deleted (cleanup)")
-        
-        return True
-    except Exception as e:
-        print(f"❌ User CRUD test failed: {e}")
-        return False
+    # Test wrong password
+    wrong_auth = await user.authenticate(db, email=user_data.email, password="WrongPass")
+    assert wrong_auth is None, "Authentication should fail with wrong password"
 
 
-def test_category_crud(db: Session):
+async def test_category_crud(db: AsyncSession):
     """Test 3: Category CRUD operations"""
-    print("\n🧪 Test 3: Category CRUD")
+    # Create category
+    cat_data = CategoryCreate(
+        name="Test Category",
+        slug="test-category",
+        description="Test description",
+        is_active=True
+    )
+    new_cat = await category.create(db, obj_in=cat_data)
     
-    try:
-        # Create category
-        cat_data = CategoryCreate(
-            name="Test Category",
-            slug="test-category",
-            description="Test description",
-            is_active=True
-        )
-        
-        # Cleanup existing
-        existing = category.get_by_slug(db, slug=cat_data.slug)
-        if existing:
-            category.delete(db, id=existing.id)
-        
-        # Create
-        new_cat = category.create(db, obj_in=cat_data)
-        print(f"✅ Category created: {new_cat.name} (ID: {new_cat.id})")
-        
-        # Test get by slug
-        found_cat = category.get_by_slug(db, slug=cat_data.slug)
-        assert found_cat is not None, "Category not found by slug"
-        assert found_cat.id == new_cat.id, "Wrong category returned"
-        print("✅ Get by slug works")
-        
-        # Test get active
-        active_cats = category.get_active(db)
-        assert any(c.id == new_cat.id for c in active_cats), "Category not in active list"
-        print("✅ Get active categories works")
-        
-        # Cleanup
-        category.delete(db, id=new_cat.id)
-        print("✅ Category deleted (cleanup)")
-        
-        return True
-    except Exception as e:
-        print(f"❌ Category CRUD test failed: {e}")
-        return False
-
-
-def test_product_crud(db: Session):
-    """Test 4: Product CRUD operations"""
-    print("\n🧪 Test 4: Product CRUD")
+    # Test get by slug
+    found_cat = await category.get_by_slug(db, slug=cat_data.slug)
+    assert found_cat is not None, "Category not found by slug"
+    assert found_cat.id == new_cat.id, "Wrong category returned"
     
-    try:
-        # First create a category
-        cat_data = CategoryCreate(
-            name="Electronics",
-            slug="electronics-test",
-            is_active=True
-        )
-        existing_cat = category.get_by_slug(db, slug=cat_data.slug)
-        if existing_cat:
-            test_cat = existing_cat
-        else:
-            test_cat = category.create(db, obj_in=cat_data)
-        
-        # Create product
-        prod_data = ProductCreate(
-            name="Test Product",
-            slug="test-product",
-            sku="TEST-001",
-            price_usd=99.99,
-            price_pln=399.99,
-            price_eur=89.99,
-            stock=10,
-            is_active=True,
-            is_featured=True,
-            images=["https://example.com/image.jpg"],
-            category_id=test_cat.id
-        )
-        
-        # Cleanup existing
-        existing = product.get_by_slug(db, slug=prod_data.slug)
-        if existing:
-            product.delete(db, id=existing.id)
-        
-        # Create
-        new_prod = product.create(db, obj_in=prod_data)
-        print(f"✅ Product created: {new_prod.name} (ID: {new_prod.id})")
-        
-        # Test get by slug
-        found_prod = product.get_by_slug(db, slug=prod_data.slug)
-        assert found_prod is not None, "Product not found by slug"
-        assert found_prod.id == new_prod.id, "Wrong product returned"
-        print("✅ Get by slug works")
-        
-        # Test get by SKU
-        found_by_sku = product.get_by_sku(db, sku=prod_data.sku)
-        assert found_by_sku is not None, "Product not found by SKU"
-        assert found_by_sku.id == new_prod.id, "Wrong product by SKU"
-        print("✅ Get by SKU works")
-        
-        # Test filtering
-        filtered = product.get_multi_with_filters(
-            db,
-            category_id=test_cat.id,
-            in_stock=True
-        )
-        assert any(p.id == new_prod.id for p in filtered), "Product not in filtered list"
-        print("✅ Filtering by category and stock works")
-        
-        # Test price range filtering
-        price_filtered = product.get_multi_with_filters(
-            db,
-            min_price_usd=50.0,
-            max_price_usd=150.0
-        )
-        assert any(p.id == new_prod.id for p in price_filtered), "Product not in price range"
-        print("✅ Price range filtering works")
-        
-        # Test search
-        search_results = product.get_multi_with_filters(
-            db,
-            search="Test"
-        )
-        assert any(p.id == new_prod.id for p in search_results), "Product not found in search"
-        print("✅ Search works")
-        
-        # Test featured products
-        featured = product.get_featured(db)
-        assert any(p.id == new_prod.id for p in featured), "Product not in featured list"
-        print("✅ Get featured products works")
-        
-        # Cleanup
-        product.delete(db, id=new_prod.id)
-        category.delete(db, id=test_cat.id)
-        print("✅ Product and category deleted (cleanup)")
-        
-        return True
-    except Exception as e:
-        print(f"❌ Product CRUD test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    # Test get active
+    active_cats = await category.get_active(db)
+    assert any(c.id == new_cat.id for c in active_cats), "Category not in active list"
 
 
-def main():
-    """Run all tests"""
-    print("=" * 60)
-    print("🚀 Starting CRUD Tests")
-    print("=" * 60)
-    
-    results = []
-    
-    # Test 1: Database connection
-    results.append(test_database_connection())
-    
-    if not results[0]:
-        print("\n❌ Database connection failed. Cannot continue tests.")
-        return
-    
-    # Create database session for other tests
-    db = SessionLocal()
+async def test_product_crud(db: AsyncSession):
+    """Test 4: Product CRUD operations"""
+    # Category fixture, created (or reused) in one round-trip
+    test_cat_id = await db.scalar(
+        pg_insert(Category)
+        .values(name="Electronics", slug="electronics-test", is_active=True)
+        .on_conflict_do_update(index_elements=["slug"], set_={"name": "Electronics"})
+        .returning(Category.id)
+    )
+    await db.commit()
     
-    try:
-        # Test 2: User CRUD
-        results.append(test_user_crud(db))
-        
-        # Test 3: Category CRUD
-        results.append(test_category_crud(db))
-        
-        # Test 4: Product CRUD
-        results.append(test_product_crud(db))
-        
-    finally:
-        db.close()
+    # Create product
+    prod_data = ProductCreate(
+        name="Test Product",
+        slug="test-product",
+        sku="TEST-001",
+        price_usd=99.99,
+        price_pln=399.99,
+        price_eur=89.99,
+        stock=10,
+        is_active=True,
+        is_featured=True,
+        images=["https://example.com/image.jpg"],
+        category_id=test_cat_id
+    )
+    new_prod = await product.create(db, obj_in=prod_data)
     
-    # Summary
-    print("\n" + "=" * 60)
-    print("📊 Test Summary")
-    print("=" * 60)
+    # Test get by slug
+    found_prod = await product.get_by_slug(db, slug=prod_data.slug)
+    assert found_prod is not None, "Product not found by slug"
+    assert found_prod.id == new_prod.id, "Wrong product returned"
     
-    test_names = [
-        "Database Connection",
-        "User CRUD",
-        "Category CRUD",
-        "Product CRUD"
-    ]
+    # Test get by SKU
+    found_by_sku = await product.get_by_sku(db, sku=prod_data.sku)
+    assert found_by_sku is not None, "Product not found by SKU"
+    assert found_by_sku.id == new_prod.id, "Wrong product by SKU"
     
-    for i, (name, result) in enumerate(zip(test_names, results), 1):
-        status = "✅ PASSED" if result else "❌ FAILED"
-        print(f"{i}. {name}: {status}")
+    # Test filtering
+    filtered = await product.get_multi_with_filters(
+        db,
+        category_id=test_cat_id,
+        in_stock=True
+    )
+    assert any(p.id == new_prod.id for p in filtered), "Product not in filtered list"
     
-    total = len(results)
-    passed = sum(results)
+    # Filter checks below are scoped to the fixture category, so they
+    # load only the test product instead of every matching row
     
-    print("\n" + "=" * 60)
-    print(f"Total: {passed}/{total} tests passed")
+    # Test price range filtering
+    price_filtered = await product.get_multi_with_filters(
+        db,
+        category_id=test_cat_id,
+        min_price_usd=50.0,
+        max_price_usd=150.0
+    )
+    assert any(p.id == new_prod.id for p in price_filtered), "Product not in price range"
     
-    if passed == total:
-        print("🎉 All tests passed!")
-    else:
-        print(f"⚠️  {total - passed} test(s) failed")
+    # Test search
+    search_results = await product.get_multi_with_filters(
+        db,
+        category_id=test_cat_id,
+        search="Test"
+    )
+    assert any(p.id == new_prod.id for p in search_results), "Product not found in search"
     
-    print("=" * 60)
-
-
-if __name__ == "__main__":
-    main()
+    # Test featured products
+    featured = await product.get_featured(db)
+    assert any(p.id == new_prod.id for p in featured), "Product not in featured list"
@@ -0,0 +1,74 @@
+"""
+Auth API tests
+Run: pytest tests/test_auth.py
+"""
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.dependencies import _token_cache, _token_cache_key, _user_token_keys
+from app.core.security import create_access_token
+from app.crud import user as crud_user
+from app.models import User
+from app.schemas.user import UserCreate
+
+pytestmark = pytest.mark.anyio
+
+ME_URL = "/api/v1/auth/me"
+
+
+async def test_cached_user_sees_profile_update(api, db: AsyncSession):
+    """A user cached by token picks up PUT /me within the cache TTL"""
+    user = await crud_user.create(db, obj_in=UserCreate(
+        email="cache@example.com",
+        password="Test1234",
+        first_name="Before",
+        last_name="User",
+    ))
+    token = create_access_token(subject=user.id)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await api.get(ME_URL, headers=headers)
+    assert response.json()["first_name"] == "Before"
+    assert _token_cache_key(token) in _token_cache, "User not cached by token"
+
+    # Changes made behind the cache's back are not seen until it expires
+    await db.execute(update(User).where(User.id == user.id).values(last_name="Stale"))
+    response = await api.get(ME_URL, headers=headers)
+    assert response.json()["last_name"] == "User", "Cached user not used"
+
+    # PUT /me drops the user's cache entries, so the next request reloads them
+    response = await api.put(ME_URL, headers=headers, json={"first_name": "After"})
+    assert response.status_code == 200
+    assert _token_cache_key(token) not in _token_cache, "Cache not invalidated"
+
+    response = await api.get(ME_URL, headers=headers)
+    assert response.json()["first_name"] == "After", "Stale cached user"
+
+
+async def test_deactivation_drops_cached_user(api, db: AsyncSession):
+    """Any crud_user.update, not just PUT /me, drops the user's cached tokens"""
+    user = await crud_user.create(db, obj_in=UserCreate(
+        email="deactivate@example.com",
+        password="Test1234",
+        first_name="Soon",
+        last_name="Inactive",
+    ))
+    # Two tokens for the same user, both cached
+    tokens = [
+        create_access_token(subject=user.id, expires_delta=timedelta(minutes=minutes))
+        for minutes in (5, 10)
+    ]
+    for token in tokens:
+        response = await api.get(ME_URL, headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 200
+    assert _user_token_keys[user.id] == {_token_cache_key(t) for t in tokens}
+
+    await crud_user.update(db, db_obj=user, obj_in={"is_active": False})
+    assert user.id not in _user_token_keys, "Index entry not dropped"
+
+    for token in tokens:
+        assert _token_cache_key(token) not in _token_cache, "Cache not invalidated"
+        response = await api.get(ME_URL, headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 400, "Deactivated user still served"
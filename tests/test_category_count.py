@@ -0,0 +1,73 @@
+"""
+Tests for categories.product_count, kept up to date by a trigger on products
+Run: pytest tests/test_category_count.py
+"""
+import pytest
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection
+from app.models import Category, Product
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_product_count_trigger(connection: AsyncConnection):
+    """Insert, move, deactivate and delete products and check both counters"""
+    trans = await connection.begin()
+    try:
+        first_id, second_id = (await connection.scalars(
+            insert(Category).returning(Category.id, sort_by_parameter_order=True),
+            [
+                {"name": "Count A", "slug": "count-test-a"},
+                {"name": "Count B", "slug": "count-test-b"},
+            ],
+        )).all()
+
+        async def counts():
+            rows = await connection.execute(
+                select(Category.id, Category.product_count)
+                .where(Category.id.in_([first_id, second_id]))
+            )
+            found = dict(rows.all())
+            return found[first_id], found[second_id]
+
+        assert await counts() == (0, 0)
+
+        # Insert: two active products and an inactive one
+        product_ids = (await connection.scalars(
+            insert(Product).returning(Product.id, sort_by_parameter_order=True),
+            [
+                dict(
+                    name=f"Count {i}",
+                    slug=f"count-test-{i}",
+                    price_usd=1.0,
+                    price_pln=4.0,
+                    price_eur=1.0,
+                    category_id=first_id,
+                    is_active=i < 2,
+                )
+                for i in range(3)
+            ],
+        )).all()
+        assert await counts() == (2, 0), "Insert not counted"
+
+        # Change of category_id moves the count
+        await connection.execute(
+            update(Product).where(Product.id == product_ids[0]).values(category_id=second_id)
+        )
+        assert await counts() == (1, 1), "Category change not counted"
+
+        # Inactive products are not counted, wherever they move
+        await connection.execute(
+            update(Product).where(Product.id == product_ids[2]).values(category_id=second_id)
+        )
+        assert await counts() == (1, 1), "Inactive product counted"
+        await connection.execute(
+            update(Product).where(Product.id == product_ids[1]).values(is_active=False)
+        )
+        assert await counts() == (0, 1), "Deactivation not counted"
+
+        # Delete
+        await connection.execute(delete(Product).where(Product.id.in_(product_ids)))
+        assert await counts() == (0, 0), "Delete not counted"
+    finally:
+        await trans.rollback()
@@ -0,0 +1,79 @@
+"""
+Product listing API tests
+Run: pytest tests/test_products.py
+"""
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Category, Product
+
+pytestmark = pytest.mark.anyio
+
+LIST_URL = "/api/v1/products/"
+
+# Listing prices, three of them tied so a page boundary falls inside the tie
+PRICES = [10.0, 20.0, 20.0, 20.0, 30.0]
+
+
+async def test_cursor_pagination(api, db: AsyncSession):
+    """Walking the keyset cursor returns every product once, in (price, id) order"""
+    category_id = await db.scalar(
+        insert(Category)
+        .values(name="Cursor", slug="cursor-test")
+        .returning(Category.id)
+    )
+    await db.execute(
+        insert(Product),
+        [
+            dict(
+                name=f"Cursor {i}",
+                slug=f"cursor-test-{i}",
+                price_usd=price,
+                price_pln=price * 4,
+                price_eur=price,
+                stock=1,
+                category_id=category_id,
+            )
+            for i, price in enumerate(PRICES)
+        ],
+    )
+    await db.commit()
+    params = {"category_id": category_id, "page_size": 2}
+
+    # First page comes from offset paging and hands out the cursor
+    first = (await api.get(LIST_URL, params=params)).json()
+    assert first["total"] == len(PRICES)
+    assert [p["price_usd"] for p in first["items"]] == [10.0, 20.0]
+    assert (first["next_after_price"], first["next_after_id"]) == (
+        first["items"][-1]["price_usd"],
+        first["items"][-1]["id"],
+    )
+
+    # Second page starts inside the tie on price_usd
+    second = (await api.get(LIST_URL, params={
+        **params,
+        "after_price": first["next_after_price"],
+        "after_id": first["next_after_id"],
+    })).json()
+    assert [p["price_usd"] for p in second["items"]] == [20.0, 20.0]
+
+    # Last page is short, so there is no further cursor
+    third = (await api.get(LIST_URL, params={
+        **params,
+        "after_price": second["next_after_price"],
+        "after_id": second["next_after_id"],
+    })).json()
+    assert [p["price_usd"] for p in third["items"]] == [30.0]
+    assert third["next_after_price"] is None and third["next_after_id"] is None
+
+    items = first["items"] + second["items"] + third["items"]
+    keys = [(p["price_usd"], p["id"]) for p in items]
+    assert keys == sorted(keys), "Pages not in (price, id) order"
+    assert len(set(keys)) == len(PRICES), "Product repeated or skipped"
+
+
+@pytest.mark.parametrize("half_cursor", [{"after_price": 20.0}, {"after_id": 1}])
+async def test_half_cursor_rejected(api, half_cursor):
+    """A cursor with only one of its two parts is a 422, not page 1 again"""
+    response = await api.get(LIST_URL, params=half_cursor)
+    assert response.status_code == 422